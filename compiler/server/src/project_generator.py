@@ -128,17 +128,18 @@ class ProjectGenerator:
                 f"  }}"
             )
             
-        router_content = (
-            "import { createRouter, createWebHashHistory } from 'vue-router'\n"
-            + "\n".join(imports) + "\n\n"
-            + "const routes = [\n"
-            + ",\n".join(routes) + "\n]\n\n"
-            + "const router = createRouter({\n"
-            + "  history: createWebHashHistory(),\n"
-            + "  routes\n"
-            + "})\n\n"
-            + "export default router\n"
-        )
+        # Materialize the file with a single join instead of chained concatenation
+        router_content = "".join([
+            "import { createRouter, createWebHashHistory } from 'vue-router'\n",
+            "\n".join(imports), "\n\n",
+            "const routes = [\n",
+            ",\n".join(routes), "\n]\n\n",
+            "const router = createRouter({\n",
+            "  history: createWebHashHistory(),\n",
+            "  routes\n",
+            "})\n\n",
+            "export default router\n",
+        ])
         
         self._write_file(router_path, router_content)
 
@@ -5,6 +5,15 @@ import re
 from pathlib import Path
 import html
 
+# Patterns used while walking every AST node, compiled once at import
+_HINT_STRIP_RE = re.compile(r'[^a-z0-9\s-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_STATE_REF_RE = re.compile(r'\$\{state\.(\w+)\}')
+_STATE_TEMPLATE_RE = re.compile(r'\$\{state\.(\w+)\}(\s*[+\-*/%]\s*\d+)?')
+_PURE_CODE_RE = re.compile(r"^[\w.()+\-*/%!\s\d]+$")
+_CAMEL_BOUNDARY_RE = re.compile(r'(?<!^)(?=[A-Z])')
+_MUSTACHE_BINDING_RE = re.compile(r'^\{\{\s*([\w.]+)\s*\}\}$')
+
 class VueGenerator:
     """
     Takes an AST (with state and events) and compiles
@@ -130,9 +139,9 @@ class VueGenerator:
                 # Convert to kebab-case, take first few words
                 hint = value.lower().strip()
                 # Remove special characters
-                hint = re.sub(r'[^a-z0-9\s-]', '', hint)
+                hint = _HINT_STRIP_RE.sub('', hint)
                 # Convert spaces to dashes
-                hint = re.sub(r'\s+', '-', hint)
+                hint = _WHITESPACE_RE.sub('-', hint)
                 # Take first 2-3 words max
                 words = hint.split('-')[:2]
                 hint = '-'.join(words)
@@ -185,7 +194,7 @@ class VueGenerator:
             # --- V14: Logic Fix for Event Handlers ---
             
             # 1. Resolve all state variables to their .value equivalent
-            resolved_value = re.sub(r'\$\{state\.(\w+)\}', replace_state_logic, resolved_value)
+            resolved_value = _STATE_REF_RE.sub(replace_state_logic, resolved_value)
 
             # 2. Check if it's a special keyword first
             if resolved_value.strip() == "event.target.value":
@@ -198,9 +207,7 @@ class VueGenerator:
                 # This regex looks for math, logic, state vars, and parens.
                 # V17: Added \ (for modulo) to regex
                 # V20: Added ! for negation operator
-                pure_code_pattern = re.compile(r"^[\w.()+\-*/%!\s\d]+$")
-
-                if pure_code_pattern.match(resolved_value):
+                if _PURE_CODE_RE.match(resolved_value):
                     # It's a pure code expression (like the carousel), return raw
                     return resolved_value, uses_event
                 else:
@@ -214,7 +221,7 @@ class VueGenerator:
         else:
             # --- Logic for Templates (Unchanged) ---
             # V18: Updated regex to handle simple state vars
-            resolved_value = re.sub(r'\$\{state\.(\w+)\}(\s*[+\-*/%]\s*\d+)?', replace_state_template, resolved_value)
+            resolved_value = _STATE_TEMPLATE_RE.sub(replace_state_template, resolved_value)
             
             if isinstance(expr_obj, str) and "{{" not in resolved_value:
                 return resolved_value, False
@@ -280,7 +287,7 @@ class VueGenerator:
             return ""
         # V18: Convert camelCase to kebab-case
         def camel_to_kebab(name):
-            return re.sub(r'(?<!^)(?=[A-Z])', '-', name).lower()
+            return _CAMEL_BOUNDARY_RE.sub('-', name).lower()
         return "; ".join([f"{camel_to_kebab(k)}: {v}" for k, v in style_obj.items()])
 
     def _generate_node(self, node, parent_context="", index_in_parent=None):
@@ -310,7 +317,7 @@ class VueGenerator:
         if isinstance(v_if, dict):
             if 'expression' in v_if:
                 # V18: Resolve state vars in v-if expressions
-                expr = re.sub(r'\$\{state\.(\w+)\}', r'\1', v_if['expression'])
+                expr = _STATE_REF_RE.sub(r'\1', v_if['expression'])
                 props_map['v-if'] = f'"{expr}"'
             elif 'stateKey' in v_if:
                 props_map['v-if'] = f'"{v_if["stateKey"]}"'
@@ -387,7 +394,7 @@ class VueGenerator:
                 elif isinstance(value, dict) and value.get('type') == 'expression':
                     resolved_value, _ = self._resolve_expression(value, is_event_handler=False)
                     # V18: Simplified binding logic
-                    match = re.match(r'^\{\{\s*([\w.]+)\s*\}\}$', resolved_value.replace('"', ''))
+                    match = _MUSTACHE_BINDING_RE.match(resolved_value.replace('"', ''))
                     if match:
                          props_map[f":{key}"] = f'"{match.group(1)}"'
                     else:
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import sys
 from pathlib import Path
@@ -64,19 +65,27 @@ async def process_action_request(request: ActionRequest) -> ActionResponse:
             exc,
         )
 
-    system_prompt = server_module.get_system_prompt(dom_snapshot)
+    # Static instructions go in the system message so the provider can cache
+    # them; only the page context changes between calls. Steps on an unchanged
+    # page reuse the prompt built for the previous step.
+    system_prompt, page_context = server_module.get_cached_system_prompt_parts(
+        dom_snapshot
+    )
 
     logger.info(
-        "Actor generating action: session=%s step=%s systemPromptChars=%s",
+        "Actor generating action: session=%s step=%s systemPromptChars=%s pageContextChars=%s",
         request.session_id,
         request.step_id,
         len(system_prompt) if system_prompt else 0,
+        len(page_context) if page_context else 0,
     )
 
-    action = generate_action(
+    action = await asyncio.to_thread(
+        generate_action,
         intent=request.intent,
         context=request.context,
         system_prompt=system_prompt,
+        page_context=page_context,
     )
 
     logger.info(
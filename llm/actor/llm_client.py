@@ -1,40 +1,55 @@
 import os
+import threading
 import httpx
 from pathlib import Path
 
 from dotenv import load_dotenv
 from openai import OpenAI
+from llm.answer import extract_answer
 
 load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
 
 MODEL_NAME = "MBZUAI-IFM/K2-Think"
 BASE_URL = "https://llm-api.k2think.ai/v1"
 
+_K2_CLIENT = None
+# Called from asyncio.to_thread workers; build the client once
+_K2_CLIENT_LOCK = threading.Lock()
+
 
 def get_k2_client():
-    """Initialize and return K2 Think OpenAI client."""
-    api_key = os.getenv("K2_API_KEY")
-    if not api_key:
-        raise ValueError("K2_API_KEY not found in environment variables")
+    """Get or create cached K2 Think OpenAI client."""
+    global _K2_CLIENT
+    if _K2_CLIENT is None:
+        with _K2_CLIENT_LOCK:
+            if _K2_CLIENT is None:
+                api_key = os.getenv("K2_API_KEY")
+                if not api_key:
+                    raise ValueError("K2_API_KEY not found in environment variables")
 
-    http_client = httpx.Client(timeout=1200.0, follow_redirects=True)
+                # Reused across calls so the connection pool keeps TLS sessions alive
+                http_client = httpx.Client(timeout=1200.0, follow_redirects=True)
 
-    return OpenAI(
-        base_url=BASE_URL,
-        api_key=api_key,
-        timeout=1200.0,
-        max_retries=2,
-        http_client=http_client,
-    )
+                _K2_CLIENT = OpenAI(
+                    base_url=BASE_URL,
+                    api_key=api_key,
+                    timeout=1200.0,
+                    max_retries=2,
+                    http_client=http_client,
+                )
+    return _K2_CLIENT
 
 
 def generate_action(
     intent: str,
     context: str,
     system_prompt: str,
+    page_context: str = "",
 ) -> str:
     """
     Generate an action based on intent and context.
+    page_context is the snapshot-specific part of the prompt; when given it is
+    sent in the user message so system_prompt stays identical across calls.
     """
     client = get_k2_client()
 
@@ -42,10 +57,16 @@ def generate_action(
     context_text = context.strip() if context else ""
     context_text = context_text if context_text else "No additional context provided."
 
-    user_content = (
-        f'{intent_text}\n"""\n\n'
-        f"Context:\n{context_text}\n\n"
-        "Follow the instructions above and respond with ONLY the JSON action payload."
+    # Built in one join so the (large) page context is copied only once
+    user_content = "".join(
+        (
+            page_context,
+            "\n\nUser Command: " if page_context else "",
+            intent_text,
+            '\n"""\n\nContext:\n',
+            context_text,
+            "\n\nFollow the instructions above and respond with ONLY the JSON action payload.",
+        )
     )
 
     response = client.chat.completions.create(
@@ -57,10 +78,6 @@ def generate_action(
         stream=False,
     )
 
-    content = response.choices[0].message.content.strip()
-
-    # Handle potential XML tags from the model
-    if "<answer>" in content and "</answer>" in content:
-        content = content.split("<answer>")[1].split("</answer>")[0].strip()
+    content = response.choices[0].message.content
 
-    return content
+    return extract_answer(content)
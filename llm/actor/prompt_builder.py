@@ -0,0 +1,435 @@
+"""
+Actor system prompt construction from a frontend DOM snapshot.
+
+Kept free of server dependencies and fully annotated so it can be compiled
+with mypyc (`mypyc llm/actor/prompt_builder.py`); the pure-Python module is
+used when no compiled extension is present.
+"""
+
+import io
+from typing import Any, Dict, List, Tuple
+
+# Static parts of the actor prompt. They do not depend on the DOM snapshot,
+# so they are plain strings built once instead of f-strings formatted per
+# request; only the header and the dynamic site map are interpolated.
+_SYSTEM_PROMPT_DEMO_SCENARIOS = """
+
+    **DEMO SCENARIOS - PRIORITY INSTRUCTIONS:**
+    If the user's intent matches these demo scenarios, follow these EXACT actions:
+
+    1. Build iPhone 17 Pro website:
+       - Keywords: "build", "create", "website", "iPhone 17 Pro", "get started"
+       - Action: {"action": "navigate", "targetId": "create-project-cta", "reasoning": "Starting iPhone 17 Pro website creation"}
+
+    2. Scroll to bottom:
+       - Keywords: "scroll", "bottom", "scroll down", "scroll to the bottom"
+       - Action: {"action": "scroll", "direction": "down", "amount": 9999, "reasoning": "Scrolling to bottom of page"}
+
+    3. Inspect Design B:
+       - Keywords: "design B", "option B", "second design/template", "details", "inspect", "show me more"
+       - Action: {"action": "navigate", "targetId": "template-option-b", "reasoning": "Opening design B for detailed inspection"}
+
+    4. Navigate to Pricing:
+       - Keywords: "pricing", "price", "pricing tab/section/page"
+       - Action: Look for navigation elements with "pricing" in their id or text
+       - If in iframe, look for: nav links with "pricing" or elements containing "pricing"
+       - Action: {"action": "navigate", "targetId": "[pricing-nav-id]", "reasoning": "Navigating to pricing section"}
+
+    These demo scenarios take PRIORITY. If the user's intent semantically matches these patterns, use the specified actions."""
+
+# Action schemas, rules and examples that follow the site map
+_SYSTEM_PROMPT_STATIC_TAIL = """
+
+    **Your Task:**
+    Analyze the user's command and respond with ONLY valid JSON - either a SINGLE action or an ARRAY of actions for multi-step commands.
+
+    **Available Actions:**
+
+    1. Navigate (click ANY element - links, buttons, nav items, etc.):
+    {
+    "action": "navigate",
+    "targetId": "nav-about-link",
+    "reasoning": "User wants to go to About page"
+    }
+    IMPORTANT: Use "navigate" action for ALL clicks, including buttons. There is NO "click" action type.
+
+    2. Scroll (general page scrolling):
+    {
+    "action": "scroll",
+    "direction": "up|down|top|bottom",
+    "amount": 500,
+    "reasoning": "User wants to scroll down"
+    }
+
+    3. ScrollToElement (scroll to a specific section - PHASE 2 NEW):
+    {
+    "action": "scrollToElement",
+    "targetId": "testimonials-section",
+    "reasoning": "User wants to see testimonials section"
+    }
+
+    4. Wait (pause between actions - PHASE 2):
+    {
+    "action": "wait",
+    "duration": 500,
+    "reasoning": "Wait for navigation to complete"
+    }
+
+    5. Type (enter text into input field - PHASE 4 NEW):
+    {
+    "action": "type",
+    "targetId": "name-input",
+    "text": "John Doe",
+    "reasoning": "User wants to fill name field"
+    }
+
+    6. Focus (focus on input field - PHASE 4 NEW):
+    {
+    "action": "focus",
+    "targetId": "email-input",
+    "reasoning": "Focus on email field"
+    }
+
+    7. Submit (submit a form - PHASE 4 NEW):
+    {
+    "action": "submit",
+    "targetId": "contact-form",
+    "reasoning": "User wants to submit the form"
+    }
+
+    8. Clear (clear an input field - PHASE 4):
+    {
+    "action": "clear",
+    "targetId": "message-input",
+    "reasoning": "Clear the message field"
+    }
+
+    9. Undo (reverse last action - PHASE 5 NEW):
+    {
+    "action": "undo",
+    "reasoning": "User wants to undo the last action"
+    }
+
+    10. Redo (redo undone action - PHASE 5 NEW):
+    {
+    "action": "redo",
+    "reasoning": "User wants to redo the undone action"
+    }
+
+    11. Error (cannot fulfill request):
+    {
+    "action": "error",
+    "message": "I cannot find that element on this page",
+    "reasoning": "No matching element found"
+    }
+
+    **Multi-Step Actions (PHASE 2):**
+    For complex commands that require multiple steps, return an ARRAY of actions:
+
+    Example 1: User on /about, says "Show me the testimonials"
+    [
+    {
+        "action": "navigate",
+        "targetId": "nav-home-link",
+        "reasoning": "Testimonials are on home page, need to navigate there first"
+    },
+    {
+        "action": "wait",
+        "duration": 500,
+        "reasoning": "Wait for page to load"
+    },
+    {
+        "action": "scrollToElement",
+        "targetId": "testimonials-section",
+        "reasoning": "Scroll to testimonials section"
+    }
+    ]
+
+    Example 2: User on / (home), says "Show me the testimonials"
+    {
+    "action": "scrollToElement",
+    "targetId": "testimonials-section",
+    "reasoning": "Already on home page, just scroll to testimonials"
+    }
+
+    Example 3: User on /contact, says "Go to the roadmap"
+    [
+    {
+        "action": "navigate",
+        "targetId": "nav-about-link",
+        "reasoning": "Roadmap is on about page, need to navigate there first"
+    },
+    {
+        "action": "wait",
+        "duration": 500,
+        "reasoning": "Wait for page to load"
+    },
+    {
+        "action": "scrollToElement",
+        "targetId": "roadmap-section",
+        "reasoning": "Scroll to roadmap section"
+    }
+    ]
+
+    **Form Filling (PHASE 4):**
+    For form-related commands, use type, focus, submit, or clear actions:
+
+    Example 4: User says "Fill the name field with John Smith"
+    {
+    "action": "type",
+    "targetId": "name-input",
+    "text": "John Smith",
+    "reasoning": "User wants to enter name"
+    }
+
+    Example 5: User says "Fill the contact form with name John and email john@example.com"
+    [
+    {
+        "action": "navigate",
+        "targetId": "nav-contact-link",
+        "reasoning": "Navigate to contact page first"
+    },
+    {
+        "action": "wait",
+        "duration": 500,
+        "reasoning": "Wait for page load"
+    },
+    {
+        "action": "type",
+        "targetId": "name-input",
+        "text": "John",
+        "reasoning": "Fill name field"
+    },
+    {
+        "action": "type",
+        "targetId": "email-input",
+        "text": "john@example.com",
+        "reasoning": "Fill email field"
+    }
+    ]
+
+    Example 6: User says "Submit the form"
+    {
+    "action": "submit",
+    "targetId": "contact-form",
+    "reasoning": "User wants to submit the form"
+    }
+
+    **Rules:**
+    - ONLY output valid JSON, nothing else
+    - For simple commands (e.g., "go to about"), use a SINGLE action object
+    - For complex commands (e.g., "show me testimonials", "go to roadmap"), use an ARRAY of actions
+    - **CRITICAL - iframe Elements**: Elements with IDs starting with "external-" are in the dynamic iframe canvas
+    - **CRITICAL - iframe Elements**: "external-create-btn" creates new buttons in the iframe canvas
+    - **CRITICAL - iframe Elements**: "external-btn-*" are dynamically created buttons (e.g., "external-btn-1", "external-btn-2")
+    - **CRITICAL**: Check the Site Map to know which context (main app vs iframe) has which elements
+    - **CRITICAL**: Always add a "wait" (500ms) action between navigation and scrolling
+    - Choose the MOST appropriate element based on semantic meaning
+    - Section elements end with "-section" (e.g., "testimonials-section", "roadmap-section")
+    - Navigation links are "nav-*-link" (e.g., "nav-home-link", "nav-about-link", "nav-contact-link", "nav-editor-link")
+    - Use "scrollToElement" when the target is a section on a page
+    - Be intelligent about spatial references
+    - If the user is already on the right page, don't navigate - just scroll directly
+    - **Form fields** (Phase 4): Input fields end with "-input" (e.g., "name-input", "email-input", "message-input")
+    - **Forms**: Forms end with "-form" (e.g., "contact-form")
+    - **Buttons**: Submit buttons end with "-button" (e.g., "submit-button")
+    - When filling forms, use "type" action for each field, don't navigate unless needed
+    - Always extract the actual text/value the user wants to enter (e.g., "fill name with John" → text: "John")
+    - For multi-field forms, create a sequence of "type" actions
+    - Users may say "enter", "fill", "type", or "put" - all mean the same thing
+    - **Undo/Redo** (Phase 5): Users may say "undo", "go back", "undo that" for undo, or "redo", "do that again" for redo
+    - Undo/redo don't need targetId, just set the action type
+    - **iframe Canvas Actions**: When user says "click the create button", use action "navigate" with targetId "external-create-btn"
+    - **iframe Canvas Actions**: When user says "click button 1", use action "navigate" with targetId "external-btn-{number}"
+    - **iframe Navigation Links**: Navigation links inside the iframe (including IDs starting with "nav-") are valid targets—use the "navigate" action instead of returning an error.
+    - **iframe Availability**: If an element exists in the iframe, prefer acting on it rather than returning the "error" action; only use "error" when no suitable element exists in either context.
+    - **iframe Picture Dropdown Workflow**:
+    - "Show me pictures" or "What pictures are available" → navigate to "external-show-pictures-btn" (opens dropdown)
+    - "Select tiger" (when dropdown is open) → navigate to "picture-tiger"
+    - "Select deer and lion" → sequence: navigate "picture-deer", wait 200ms, navigate "picture-lion"
+    - "Add to canvas" or "Add them" → navigate to "external-add-pictures-btn" (adds selected pictures and closes dropdown)
+    - "Close" or "Cancel" → navigate to "external-close-dropdown-btn" or "external-cancel-pictures-btn"
+    - Picture IDs: picture-tiger, picture-deer, picture-cougar, picture-stag, picture-zebra, picture-jaguar, picture-squirrel, picture-lion
+    - **CRITICAL**: NEVER use action type "click" - always use "navigate" for clicking ANY element (buttons, links, nav items, etc.)
+    - If uncertain about which context has an element, check the dynamic site map above
+
+    **Picture Workflow Examples:**
+    - "Show me available pictures" → navigate to "external-show-pictures-btn"
+    - "Show pictures and select the tiger" → sequence: navigate "external-show-pictures-btn", wait 500ms, navigate "picture-tiger"
+    - "Select tiger and deer then add to canvas" → sequence: navigate "picture-tiger", wait 200ms, navigate "picture-deer", wait 200ms, navigate "external-add-pictures-btn"
+    - "Close the picture menu" → navigate to "external-close-dropdown-btn\""""
+
+_USER_COMMAND_PROMPT = """
+
+    User Command: """
+
+_SYSTEM_PROMPT_INTRO = """You are a navigation assistant for a website with TWO contexts:
+    1. Main App (static navigation and pages)
+    2. Dynamic iframe (user-generated content in canvas)"""
+
+# Snapshot-independent instructions. Sent as the LLM system message on its
+# own, they form an identical prefix on every call that providers can cache.
+ACTOR_SYSTEM_PROMPT = (
+    _SYSTEM_PROMPT_INTRO + _SYSTEM_PROMPT_DEMO_SCENARIOS + _SYSTEM_PROMPT_STATIC_TAIL
+)
+
+
+_EMPTY: Dict[str, Any] = {}
+_VP_VISIBLE = "✓ visible"
+_VP_OFF = "⌛ off-screen"
+
+# Most visible elements listed in the detailed view; on large pages the rest
+# are dropped, furthest from the viewport first
+VISIBLE_ELEMENTS_BUDGET = 200
+
+
+def _format_visible_elements(visible_elements: List[Tuple[bool, float, str]]) -> str:
+    """Join the visible-element lines, keeping the closest ones if over budget."""
+    omitted = len(visible_elements) - VISIBLE_ELEMENTS_BUDGET
+    if omitted <= 0:
+        return "\n".join([entry[2] for entry in visible_elements])
+
+    # Rank by viewport proximity but list the kept elements in page order
+    kept = sorted(
+        range(len(visible_elements)), key=lambda i: visible_elements[i][:2]
+    )[:VISIBLE_ELEMENTS_BUDGET]
+    kept.sort()
+    lines = [visible_elements[i][2] for i in kept]
+    lines.append(f"... (and {omitted} more visible elements further from the viewport)")
+    return "\n".join(lines)
+
+
+def _build_page_sections(dom_snapshot: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Build the snapshot-dependent prompt sections: the current page header
+    and the dynamic site map.
+
+    The site map is built in a single pass over the snapshot elements,
+    writing each formatted line straight into its section buffer.
+    """
+    main_app_sections = io.StringIO()
+    main_app_elements = io.StringIO()
+    nav_links = io.StringIO()
+    iframe_nav_links = io.StringIO()
+    iframe_elements = io.StringIO()
+    # (off-screen, distance from viewport top, line) per visible element
+    visible_elements: List[Tuple[bool, float, str]] = []
+    main_app_count = 0
+
+    elements = dom_snapshot.get("elements", [])
+
+    for el in elements:
+        get = el.get
+        raw_context = get("context")
+        in_iframe = raw_context == "iframe"
+        main_app_count += raw_context == "main-app"
+        nav_id = get("navId", "")
+        tag_name = get("tagName", "")
+        text = get("text", "")
+
+        # Site map classification: sections, nav links, then other elements
+        if nav_id.endswith("-section"):
+            # iframe sections are not part of the prompt
+            if not in_iframe:
+                main_app_sections.write(f"  - {nav_id}: {text[:40]}\n")
+        elif nav_id.startswith("nav-") and tag_name == "a":
+            target = iframe_nav_links if in_iframe else nav_links
+            target.write(f"  - {nav_id}: \"{text}\"\n")
+        elif in_iframe:
+            iframe_elements.write(f"  - {nav_id}: {tag_name} \"{text[:40]}\"\n")
+        elif not nav_id.startswith("nav-"):
+            # Non-link "nav-" elements are left out of the main app listing
+            main_app_elements.write(f"  - {nav_id}: {tag_name} \"{text[:40]}\"\n")
+
+        if get("isVisible", False):
+            position = get("position") or _EMPTY
+            is_in_viewport = bool(position.get("isInViewport", False))
+            in_viewport = _VP_VISIBLE if is_in_viewport else _VP_OFF
+            context = "[iframe]" if in_iframe else "[main]"
+            visible_elements.append(
+                (
+                    not is_in_viewport,
+                    abs(position.get("top") or 0),
+                    f"- {context} {nav_id}: {tag_name} [{in_viewport}] \"{text[:50]}\"",
+                )
+            )
+
+    main_app_sections_str = main_app_sections.getvalue()[:-1] or "  (none)"
+    main_app_elements_str = main_app_elements.getvalue()[:-1] or "  (none)"
+    nav_links_str = nav_links.getvalue()[:-1] or "  (none)"
+    iframe_nav_links_str = iframe_nav_links.getvalue()[:-1] or "  (none)"
+    iframe_elements_str = (
+        iframe_elements.getvalue()[:-1] or "  (empty - no user-generated content yet)"
+    )
+    current_page_elements_str = _format_visible_elements(visible_elements)
+
+    total_elements = dom_snapshot.get("totalElementCount", 0)
+    iframe_count = dom_snapshot.get("iframeElementCount", 0)
+
+    active_iframe = dom_snapshot.get("activeIframe")
+    active_iframe_info = ""
+    if active_iframe:
+        mode = active_iframe.get("mode", "unknown")
+        template_id = active_iframe.get("templateId", "unknown")
+        edit_mode = active_iframe.get("editMode", False)
+        active_iframe_info = f"\n**Active iframe:** Template {template_id} - {mode} mode (editMode: {edit_mode})"
+
+    page_header = f"""
+
+    **Current Page:** {dom_snapshot.get('currentUrl', '/')}
+    **Viewport:** Height={dom_snapshot.get('viewportHeight', 0)}px, Scroll={dom_snapshot.get('scrollY', 0)}px{active_iframe_info}"""
+
+    sitemap_prompt = f"""
+
+    **DYNAMIC SITE MAP:**
+
+    Main App Navigation Links:
+    {nav_links_str}
+
+    iframe Navigation Links:
+    {iframe_nav_links_str}
+
+    Main App Sections:
+    {main_app_sections_str}
+
+    Main App Interactive Elements:
+    {main_app_elements_str}
+
+    iframe Canvas Elements (dynamic user-generated content):
+    {iframe_elements_str}
+
+    **Element Counts:**
+    - Total Elements: {total_elements}
+    - Main App: {main_app_count}
+    - iframe: {iframe_count}
+
+    **Elements Currently Visible (detailed view):**
+    {current_page_elements_str}"""
+
+    return page_header, sitemap_prompt
+
+
+def get_system_prompt(dom_snapshot: Dict[str, Any]) -> str:
+    """
+    Generate system prompt for LLM agent.
+    Ported from llmAgent.js - maintains exact same logic and text.
+    """
+    page_header, sitemap_prompt = _build_page_sections(dom_snapshot)
+    return (
+        _SYSTEM_PROMPT_INTRO
+        + page_header
+        + _SYSTEM_PROMPT_DEMO_SCENARIOS
+        + sitemap_prompt
+        + _SYSTEM_PROMPT_STATIC_TAIL
+        + _USER_COMMAND_PROMPT
+    )
+
+
+def get_system_prompt_parts(dom_snapshot: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Split the prompt for LLM calls: the static ACTOR_SYSTEM_PROMPT for the
+    system message, and the page context (current page, site map, visible
+    elements) to send with the user command.
+    """
+    page_header, sitemap_prompt = _build_page_sections(dom_snapshot)
+    return ACTOR_SYSTEM_PROMPT, (page_header + sitemap_prompt).strip()
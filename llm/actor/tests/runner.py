@@ -6,6 +6,7 @@ These tests execute the actor pipeline with controlled mocks to avoid external d
 import asyncio
 import json
 import time
+from collections import OrderedDict
 from copy import deepcopy
 from pathlib import Path
 import sys
@@ -91,7 +92,9 @@ async def run_single_test(test_case: Dict[str, Any]) -> Dict[str, Any]:
     start = time.time()
 
     fetch_mock = make_async_fetch_mock(test_case)
-    get_prompt_mock = MagicMock(return_value=test_case["mock_system_prompt"])
+    get_prompt_mock = MagicMock(
+        return_value=(test_case["mock_system_prompt"], test_case["mock_page_context"])
+    )
     generate_mock = MagicMock(return_value=test_case["mock_action_output"])
     load_calls: List[str] = []
     saved_sessions: List[Dict[str, Any]] = []
@@ -107,7 +110,9 @@ async def run_single_test(test_case: Dict[str, Any]) -> Dict[str, Any]:
     )
 
     with patch("llm.server.fetch_dom_snapshot", fetch_mock):
-        with patch("llm.server.get_system_prompt", get_prompt_mock):
+        with patch("llm.server.get_system_prompt_parts", get_prompt_mock), patch(
+            "llm.server._system_prompt_parts_cache", OrderedDict()
+        ):
             with patch("llm.actor.actor.generate_action", generate_mock):
                 with patch("llm.actor.llm_client.generate_action", generate_mock):
                     with patch(
@@ -139,7 +144,7 @@ async def run_single_test(test_case: Dict[str, Any]) -> Dict[str, Any]:
 
     context = {
         "fetch_dom_snapshot_calls": [call.args for call in fetch_mock.await_args_list],
-        "get_system_prompt_calls": [
+        "get_system_prompt_parts_calls": [
             (call.args, call.kwargs) for call in get_prompt_mock.call_args_list
         ],
         "generate_action_calls": [
@@ -52,6 +52,7 @@ ACTOR_TESTS = [
         "context": "User wants more information about the company.",
         "mock_dom_snapshot_response": _base_dom_snapshot(),
         "mock_system_prompt": "SYSTEM PROMPT :: navigation",
+        "mock_page_context": "PAGE CONTEXT :: navigation",
         "mock_action_output": (
             '{"action":"navigate","targetId":"nav-about-link","reasoning":"User '
             'requested the about page."}'
@@ -71,6 +72,7 @@ ACTOR_TESTS = [
         "context": "",
         "snapshot_error": RuntimeError("Websocket bridge unreachable"),
         "mock_system_prompt": "SYSTEM PROMPT :: empty snapshot",
+        "mock_page_context": "PAGE CONTEXT :: empty snapshot",
         "mock_action_output": '{"action":"scroll","direction":"down","amount":500}',
         "expected_action_output": '{"action":"scroll","direction":"down","amount":500}',
         "seed_session": {"sid": "actor-session-002"},
@@ -123,6 +125,7 @@ ACTOR_TESTS = [
             "timestamp": "2025-01-01T00:05:00.000Z",
         },
         "mock_system_prompt": "SYSTEM PROMPT :: forms",
+        "mock_page_context": "PAGE CONTEXT :: forms",
         "mock_action_output": '{"action":"focus","targetId":"email-input"}',
         "expected_action_output": '{"action":"focus","targetId":"email-input"}',
         "seed_session": {
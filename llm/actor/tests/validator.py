@@ -38,6 +38,10 @@ def validate_generate_action_call(test: Dict[str, Any], call_kwargs: Dict[str, A
     if call_kwargs.get("system_prompt") != expected_prompt:
         errors.append("generate_action system_prompt mismatch")
 
+    expected_page_context = test["mock_page_context"]
+    if call_kwargs.get("page_context") != expected_page_context:
+        errors.append("generate_action page_context mismatch")
+
     expected_snapshot = test.get("expected_dom_snapshot_for_prompt")
     actual_snapshot = call_kwargs.get("dom_snapshot")
     if expected_snapshot is not None and actual_snapshot != expected_snapshot:
@@ -130,11 +134,11 @@ def run_all_validations(
             passed = False
             errors.extend(generate_errors)
 
-    prompt_calls = context.get("get_system_prompt_calls", [])
-    assertions["get_system_prompt_called_once"] = len(prompt_calls) == 1
+    prompt_calls = context.get("get_system_prompt_parts_calls", [])
+    assertions["get_system_prompt_parts_called_once"] = len(prompt_calls) == 1
     if len(prompt_calls) != 1:
         passed = False
-        errors.append(f"get_system_prompt expected 1 call, saw {len(prompt_calls)}")
+        errors.append(f"get_system_prompt_parts expected 1 call, saw {len(prompt_calls)}")
     else:
         prompt_args, _ = prompt_calls[0]
         expected_snapshot = test.get("expected_dom_snapshot_for_prompt")
@@ -143,7 +147,7 @@ def run_all_validations(
             assertions["dom_snapshot_passed_to_prompt"] = snapshot_passed
             if not snapshot_passed:
                 passed = False
-                errors.append("get_system_prompt received unexpected dom_snapshot")
+                errors.append("get_system_prompt_parts received unexpected dom_snapshot")
 
     fetch_calls = context.get("fetch_dom_snapshot_calls", [])
     expected_fetch_calls = 1
@@ -0,0 +1,41 @@
+"""Helpers shared by the agents that parse K2 Think replies."""
+
+
+def extract_answer(content: str) -> str:
+    """
+    Return the <answer> payload, or the reply with any <think> blocks removed.
+    K2 Think wraps its payload in <answer> after a <think> block.
+    """
+    # Fixed tags, so plain str.find scans instead of regex searches
+    start = content.find("<answer>")
+    if start != -1:
+        end = content.find("</answer>", start + 8)
+        if end != -1:
+            return content[start + 8 : end].strip()
+
+    parts = []
+    pos = 0
+    while True:
+        start = content.find("<think>", pos)
+        if start == -1:
+            break
+        end = content.find("</think>", start + 7)
+        if end == -1:
+            break
+        parts.append(content[pos:start])
+        pos = end + 8
+    parts.append(content[pos:])
+    return "".join(parts).strip()
+
+
+def extract_json_payload(content: str) -> str:
+    """Return the text inside <answer> tags or the first fenced code block."""
+    _, tag, rest = content.partition("<answer>")
+    if tag and "</answer>" in content:
+        # Same span as split("<answer>")[1].split("</answer>")[0]
+        return rest.partition("<answer>")[0].partition("</answer>")[0].strip()
+    for fence in ("```json", "```"):
+        _, opening, rest = content.partition(fence)
+        if opening:
+            return rest.partition(fence)[0].partition("```")[0].strip()
+    return content
@@ -1,7 +1,9 @@
 from pathlib import Path
 import os
+import threading
 import json
 from openai import OpenAI
+from llm.answer import extract_answer
 from dotenv import load_dotenv
 import httpx
 
@@ -10,23 +12,32 @@ load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
 MODEL_NAME = "MBZUAI-IFM/K2-Think"
 BASE_URL = "https://llm-api.k2think.ai/v1"
 
+_K2_CLIENT = None
+# Called from asyncio.to_thread workers; build the client once
+_K2_CLIENT_LOCK = threading.Lock()
+
 
 def get_k2_client():
-    """Initialize and return K2 Think OpenAI client."""
-    api_key = os.getenv("K2_API_KEY")
-    if not api_key:
-        raise ValueError("K2_API_KEY not found in environment variables")
-
-    # Create a custom httpx client without proxies to avoid compatibility issues
-    http_client = httpx.Client(timeout=1200.0, follow_redirects=True)
-
-    return OpenAI(
-        base_url=BASE_URL,
-        api_key=api_key,
-        timeout=1200.0,
-        max_retries=2,
-        http_client=http_client,
-    )
+    """Get or create cached K2 Think OpenAI client."""
+    global _K2_CLIENT
+    if _K2_CLIENT is None:
+        with _K2_CLIENT_LOCK:
+            if _K2_CLIENT is None:
+                api_key = os.getenv("K2_API_KEY")
+                if not api_key:
+                    raise ValueError("K2_API_KEY not found in environment variables")
+
+                # Create a custom httpx client without proxies to avoid compatibility issues
+                http_client = httpx.Client(timeout=1200.0, follow_redirects=True)
+
+                _K2_CLIENT = OpenAI(
+                    base_url=BASE_URL,
+                    api_key=api_key,
+                    timeout=1200.0,
+                    max_retries=2,
+                    http_client=http_client,
+                )
+    return _K2_CLIENT
 
 
 def generate_clarification(intent: str, context: str) -> str:
@@ -88,10 +99,6 @@ Respond with ONLY the clarification question - no JSON, no extra formatting. Jus
         model=MODEL_NAME, messages=messages, stream=False
     )
 
-    content = response.choices[0].message.content.strip()
-
-    # Handle potential XML tags from the model
-    if "<answer>" in content and "</answer>" in content:
-        content = content.split("<answer>")[1].split("</answer>")[0].strip()
+    content = response.choices[0].message.content
 
-    return content
+    return extract_answer(content)
@@ -0,0 +1,65 @@
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+EDIT_CACHE_ENABLED = os.getenv("EDIT_CACHE_ENABLED", "").lower() in {"1", "true", "yes"}
+EDIT_CACHE_SIZE = int(os.getenv("EDIT_CACHE_SIZE", "512"))
+
+
+def prompt_key(prompt: str) -> str:
+    """Hash an editor prompt into a compact cache key."""
+    return hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+
+
+class EditCache:
+    """
+    LRU cache of generated components keyed by the exact editor prompt.
+    Concurrent edit steps run the editor in worker threads, so every access
+    holds the lock.
+    """
+
+    def __init__(self, max_size: int = EDIT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries: "OrderedDict[str, dict]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, prompt: str) -> Optional[dict]:
+        """Return a fresh copy of the component generated for this prompt, if any."""
+        key = prompt_key(prompt)
+        with self.lock:
+            component = self.entries.get(key)
+            if component is None:
+                return None
+            self.entries.move_to_end(key)
+        return copy.deepcopy(component)
+
+    def put(self, prompt: str, component: dict):
+        key = prompt_key(prompt)
+        component = copy.deepcopy(component)
+        with self.lock:
+            self.entries[key] = component
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+# Global edit cache instance
+_edit_cache = None
+_edit_cache_lock = threading.Lock()
+
+
+def get_edit_cache() -> EditCache:
+    """Get or create global edit cache instance."""
+    global _edit_cache
+    if _edit_cache is None:
+        with _edit_cache_lock:
+            if _edit_cache is None:
+                _edit_cache = EditCache()
+    return _edit_cache
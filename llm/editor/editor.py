@@ -1,3 +1,4 @@
+import asyncio
 import json
 from pathlib import Path
 from .models import EditRequest, EditResponse
@@ -9,17 +10,28 @@ from .manifest_loader import load_all_manifests
 AST_PATH = Path(__file__).resolve().parents[2] / "compiler" / "server" / "inputs" / "home.json"
 
 
+# Parsed home.json and the (mtime, size) it was read at
+_AST_CACHE = None
+_AST_CACHE_KEY = None
+
+
 def load_current_ast() -> dict:
-    """Load the current page AST from home.json."""
+    """Load the current page AST from home.json, re-reading it only after it changes."""
+    global _AST_CACHE, _AST_CACHE_KEY
     try:
-        with open(AST_PATH, 'r') as f:
-            return json.load(f)
+        stat = AST_PATH.stat()
+        cache_key = (stat.st_mtime_ns, stat.st_size)
+        if cache_key != _AST_CACHE_KEY:
+            with open(AST_PATH, 'r') as f:
+                _AST_CACHE = json.load(f)
+            _AST_CACHE_KEY = cache_key
+        return _AST_CACHE
     except Exception as e:
         print(f"Error loading AST: {e}")
         return {"state": {}, "tree": {"id": "root", "type": "Box", "props": {}, "slots": {"default": []}}}
 
 
-def process_edit_request(request: EditRequest) -> EditResponse:
+async def process_edit_request(request: EditRequest) -> EditResponse:
     """
     Process edit request through the editor agent using optimized single-step LLM process.
     
@@ -42,7 +54,8 @@ def process_edit_request(request: EditRequest) -> EditResponse:
     current_ast = load_current_ast()
     
     # Single LLM call to generate component directly
-    component = generate_component_direct(
+    component = await asyncio.to_thread(
+        generate_component_direct,
         intent=request.intent,
         context=request.context,
         manifests=manifests,
@@ -1,42 +1,125 @@
 from pathlib import Path
 import os
+import threading
 import json
+import orjson
 from openai import OpenAI
 from dotenv import load_dotenv
 import httpx
+from llm.answer import extract_json_payload
+from .edit_cache import EDIT_CACHE_ENABLED, get_edit_cache
 
 load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
 
 MODEL_NAME = "MBZUAI-IFM/K2-Think"
 BASE_URL = "https://llm-api.k2think.ai/v1"
 
+
+# Request-independent editor instructions (structure inspired by the
+# compiler's prompt.md). Sent as the system message on its own, they form an
+# identical prefix on every call that providers can cache.
+EDITOR_SYSTEM_PROMPT = """**AVAILABLE COMPONENTS**:
+- Box (div): layout container. Props: style, as ("div"|"section"|"header"|"footer"). Slots: ["default"]
+- Text (p): all text. Props: content, style, as ("p"|"h1"|"h2"|"h3"|"span"). Slots: {}
+- Button: interactive button. Props: text, style. Slots: ["default"]. Events: ["click"]
+- Image: img. Props: src, alt, style. Slots: {}
+- Link (a): hyperlink. Props: href, target, style. Slots: ["default"]
+- List (ul): list. Props: items (array), style. Slots: ["default"]
+- Table: table. Props: headers (array), rows (array[array]), style. Slots: {}
+- Textbox (input): input field. Props: placeholder, modelValue (state binding), style. Events: ["input"]
+- Icon (svg): icon. Props: svgPath, viewBox, style. Slots: {}
+- Card: styled container. Props: style, variant ("default"|"elevated"|"outlined"). Slots: ["default","header","footer"]
+- GradientText: animated gradient text. Props: content, as, gradientFrom, gradientTo, animated. Slots: {}
+- Accordion: collapsible section. Props: title, isOpen (state), icon. Slots: ["default"]. Events: ["click"]
+
+**RULES**:
+- Output ONLY JSON (no markdown, no text)
+- id: semantic kebab-case (e.g., "submit-button", "hero-title", "feature-card")
+- type: exact component name from list above
+- props: style object with camelCase keys (fontSize, backgroundColor, padding, margin, etc.)
+- slots: {} or {"default": [child components]}
+- Modern professional styling: flexbox/grid, good spacing, clean colors
+
+**EXAMPLE**:
+{
+  "id": "submit-button",
+  "type": "Button",
+  "props": {
+    "text": "Submit",
+    "style": {
+      "fontSize": "16px",
+      "padding": "10px 20px",
+      "backgroundColor": "#007bff",
+      "color": "#fff",
+      "border": "none",
+      "borderRadius": "4px"
+    }
+  },
+  "slots": {}
+}"""
+
 _K2_CLIENT = None
+# Concurrent edit steps call the editor from worker threads; build the client once
+_K2_CLIENT_LOCK = threading.Lock()
 
 
 def get_k2_client():
     """Get or create cached K2 Think OpenAI client."""
     global _K2_CLIENT
     if _K2_CLIENT is None:
-        api_key = os.getenv("K2_API_KEY")
-        if not api_key:
-            raise ValueError("K2_API_KEY not found in environment variables")
-        
-        http_client = httpx.Client(
-            timeout=1200.0,
-            follow_redirects=True
-        )
-        
-        _K2_CLIENT = OpenAI(
-            base_url=BASE_URL,
-            api_key=api_key,
-            timeout=1200.0,
-            max_retries=2,
-            http_client=http_client
-        )
+        with _K2_CLIENT_LOCK:
+            if _K2_CLIENT is None:
+                api_key = os.getenv("K2_API_KEY")
+                if not api_key:
+                    raise ValueError("K2_API_KEY not found in environment variables")
+                
+                http_client = httpx.Client(
+                    timeout=1200.0,
+                    follow_redirects=True
+                )
+                
+                _K2_CLIENT = OpenAI(
+                    base_url=BASE_URL,
+                    api_key=api_key,
+                    timeout=1200.0,
+                    max_retries=2,
+                    http_client=http_client
+                )
     
     return _K2_CLIENT
 
 
+ANSWER_OPEN = "<answer>"
+ANSWER_CLOSE = "</answer>"
+
+
+def read_until_answer(stream) -> str:
+    """
+    Collect a streamed completion, stopping once the <answer> block is closed.
+    Nothing after </answer> is ever parsed, so the rest of the stream is
+    dropped instead of waited for.
+    """
+    deltas = []
+    tail = ""
+    opened = False
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content or ""
+        deltas.append(delta)
+        # Tags can be split across deltas, so search the carried-over tail too
+        window = tail + delta
+        if not opened:
+            opened = ANSWER_OPEN in window
+            if opened:
+                window = window[window.index(ANSWER_OPEN) + len(ANSWER_OPEN):]
+        if opened and ANSWER_CLOSE in window:
+            stream.close()
+            break
+        tail = window[-(len(ANSWER_CLOSE) - 1):]
+    return "".join(deltas)
+
+
 def generate_component_direct(intent: str, context: str, manifests: dict, current_ast: dict = None) -> dict:
     """
     Generate a component directly in a single LLM call.
@@ -64,71 +147,36 @@ def generate_component_direct(intent: str, context: str, manifests: dict, curren
 {ast_str}
 ```"""
     
-    # Structured prompt inspired by compiler's prompt.md
-    prompt = f"""**USER REQUEST**: {intent}
-
-**CONTEXT**: {context}{ast_section}
-
-**AVAILABLE COMPONENTS**:
-- Box (div): layout container. Props: style, as ("div"|"section"|"header"|"footer"). Slots: ["default"]
-- Text (p): all text. Props: content, style, as ("p"|"h1"|"h2"|"h3"|"span"). Slots: {{}}
-- Button: interactive button. Props: text, style. Slots: ["default"]. Events: ["click"]
-- Image: img. Props: src, alt, style. Slots: {{}}
-- Link (a): hyperlink. Props: href, target, style. Slots: ["default"]
-- List (ul): list. Props: items (array), style. Slots: ["default"]
-- Table: table. Props: headers (array), rows (array[array]), style. Slots: {{}}
-- Textbox (input): input field. Props: placeholder, modelValue (state binding), style. Events: ["input"]
-- Icon (svg): icon. Props: svgPath, viewBox, style. Slots: {{}}
-- Card: styled container. Props: style, variant ("default"|"elevated"|"outlined"). Slots: ["default","header","footer"]
-- GradientText: animated gradient text. Props: content, as, gradientFrom, gradientTo, animated. Slots: {{}}
-- Accordion: collapsible section. Props: title, isOpen (state), icon. Slots: ["default"]. Events: ["click"]
-
-**RULES**:
-- Output ONLY JSON (no markdown, no text)
-- id: semantic kebab-case (e.g., "submit-button", "hero-title", "feature-card")
-- type: exact component name from list above
-- props: style object with camelCase keys (fontSize, backgroundColor, padding, margin, etc.)
-- slots: {{}} or {{"default": [child components]}}
-- Modern professional styling: flexbox/grid, good spacing, clean colors
-
-**EXAMPLE**:
-{{
-  "id": "submit-button",
-  "type": "Button",
-  "props": {{
-    "text": "Submit",
-    "style": {{
-      "fontSize": "16px",
-      "padding": "10px 20px",
-      "backgroundColor": "#007bff",
-      "color": "#fff",
-      "border": "none",
-      "borderRadius": "4px"
-    }}
-  }},
-  "slots": {{}}
-}}"""
-
-    messages = [{"role": "user", "content": prompt}]
+    # Only the request, context and page AST vary; the static instructions go
+    # in the system message so the provider can cache them as a prefix
+    user_content = f"**USER REQUEST**: {intent}\n\n**CONTEXT**: {context}{ast_section}"
+
+    # Identical prompt (same request, context and page AST) -> reuse the component.
+    # The system message is constant, so the user message alone is the key.
+    edit_cache = get_edit_cache() if EDIT_CACHE_ENABLED else None
+    if edit_cache is not None:
+        cached = edit_cache.get(user_content)
+        if cached is not None:
+            return cached
+
+    messages = [
+        {"role": "system", "content": EDITOR_SYSTEM_PROMPT},
+        {"role": "user", "content": user_content},
+    ]
     
-    response = client.chat.completions.create(
+    stream = client.chat.completions.create(
         model=MODEL_NAME,
         messages=messages,
-        stream=False
+        stream=True
     )
     
-    content = response.choices[0].message.content.strip()
+    content = read_until_answer(stream).strip()
     
     # Parse response handling <think> and <answer> tags
     try:
-        if "<answer>" in content and "</answer>" in content:
-            content = content.split("<answer>")[1].split("</answer>")[0].strip()
-        elif "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
+        content = extract_json_payload(content)
         
-        component = json.loads(content)
+        component = orjson.loads(content)
         
         # Validate required fields
         if "id" not in component:
@@ -136,6 +184,9 @@ def generate_component_direct(intent: str, context: str, manifests: dict, curren
         if "type" not in component:
             component["type"] = "Box"
         
+        if edit_cache is not None:
+            edit_cache.put(user_content, component)
+        
         return component
     except (json.JSONDecodeError, ValueError) as e:
         # Return minimal valid component
@@ -215,14 +266,9 @@ Examples:
     
     # Parse response handling <think> and <answer> tags
     try:
-        if "<answer>" in content and "</answer>" in content:
-            content = content.split("<answer>")[1].split("</answer>")[0].strip()
-        elif "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
+        content = extract_json_payload(content)
         
-        result = json.loads(content)
+        result = orjson.loads(content)
         
         # Validate required fields
         if "action" not in result or "component_type" not in result:
@@ -360,14 +406,9 @@ Output ONLY the JSON object, no other text."""
     
     # Parse response handling <think> and <answer> tags
     try:
-        if "<answer>" in content and "</answer>" in content:
-            content = content.split("<answer>")[1].split("</answer>")[0].strip()
-        elif "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
+        content = extract_json_payload(content)
         
-        component = json.loads(content)
+        component = orjson.loads(content)
         
         if "id" not in component:
             component["id"] = "generated-component"
@@ -1,12 +1,14 @@
+import asyncio
 import logging
 import sys
 import time
-from typing import List
+from typing import List, Tuple
 from llm.planner.models import (
     PlanRequest,
     PlanResponse,
     AgentResult,
     DecideRequest,
+    DecideResponse,
     StepType,
     TimingMetadata,
 )
@@ -29,6 +31,42 @@ if not logger.handlers:
     logger.setLevel(logging.INFO)
 
 
+async def run_edit_task(
+    sid: str, decide_response: DecideResponse
+) -> Tuple[AgentResult, dict]:
+    """Run one EDIT step and return its agent result and timing entry."""
+    step_id = decide_response.step_id
+    logger.info("Routing to EDIT agent for step: %s", step_id)
+
+    agent_start = time.time()
+    edit_request = EditRequest(
+        session_id=sid,
+        step_id=step_id,
+        intent=decide_response.intent,
+        context=decide_response.context_text,
+    )
+    edit_response = await process_edit_request(edit_request)
+
+    agent_duration = time.time() - agent_start
+
+    agent_result = AgentResult(
+        session_id=edit_response.session_id,
+        step_id=edit_response.step_id,
+        intent=edit_response.intent,
+        context=edit_response.context,
+        result=edit_response.code,
+        agent_type="edit",
+        execution_time_seconds=round(agent_duration, 3),
+    )
+    task_timing = {
+        "step_id": step_id,
+        "agent_type": "edit",
+        "duration_seconds": round(agent_duration, 3),
+    }
+    logger.info("EDIT agent completed for step: %s in %.3fs", step_id, agent_duration)
+    return agent_result, task_timing
+
+
 async def execute_plan(request: PlanRequest) -> PlanResponse:
     """
     Execute the full plan orchestration pipeline.
@@ -36,7 +74,8 @@ async def execute_plan(request: PlanRequest) -> PlanResponse:
     Steps:
     1. Log request received
     2. Call planner to get list of tasks (with timing)
-    3. For each task, route to appropriate agent based on step_type (with timing)
+    3. For each task, route to appropriate agent based on step_type (with timing);
+       consecutive edit tasks run concurrently
     4. Collect all results with timing metadata
     5. Return aggregated response with detailed timing
 
@@ -50,7 +89,7 @@ async def execute_plan(request: PlanRequest) -> PlanResponse:
         Exception: Any error from planner or agents (fail fast)
     """
     overall_start = time.time()
-    logger.info(f"Plan request received for session: {request.sid}")
+    logger.info("Plan request received for session: %s", request.sid)
 
     # Time the planner
     decide_request = DecideRequest(
@@ -58,63 +97,73 @@ async def execute_plan(request: PlanRequest) -> PlanResponse:
         text=request.text,
         step_id=request.step_id,
     )
-    logger.info(f"Calling planner for session: {request.sid}")
+    logger.info("Calling planner for session: %s", request.sid)
 
     planner_start = time.time()
     decide_responses = await process_user_request(decide_request)
     planner_duration = time.time() - planner_start
 
     logger.info(
-        f"Planner identified {len(decide_responses)} task(s) for session: {request.sid} in {planner_duration:.3f}s"
+        "Planner identified %d task(s) for session: %s in %.3fs",
+        len(decide_responses),
+        request.sid,
+        planner_duration,
     )
 
     results: List[AgentResult] = []
     task_timings = []
+    # Wall-clock agent time: a gathered edit batch counts once, not per task
+    total_agent_time = 0.0
 
-    for idx, decide_response in enumerate(decide_responses):
+    idx = 0
+    while idx < len(decide_responses):
+        decide_response = decide_responses[idx]
         step_id = decide_response.step_id
         step_type = decide_response.step_type
         intent = decide_response.intent
-        context = decide_response.context
-
-        logger.info(
-            f"Processing task {idx + 1}/{len(decide_responses)} - Step ID: {step_id}, Type: {step_type}"
-        )
-
-        agent_start = time.time()
+        context = decide_response.context_text
 
         if step_type == StepType.EDIT:
-            logger.info(f"Routing to EDIT agent for step: {step_id}")
-            edit_request = EditRequest(
-                session_id=request.sid, step_id=step_id, intent=intent, context=context
+            # Edits only read the page AST, so a run of consecutive edit steps
+            # is independent and their LLM calls can overlap
+            end = idx + 1
+            while (
+                end < len(decide_responses)
+                and decide_responses[end].step_type == StepType.EDIT
+            ):
+                end += 1
+            edit_batch = decide_responses[idx:end]
+            for offset, edit_response in enumerate(edit_batch):
+                logger.info(
+                    "Processing task %d/%d - Step ID: %s, Type: %s",
+                    idx + offset + 1,
+                    len(decide_responses),
+                    edit_response.step_id,
+                    edit_response.step_type,
+                )
+            batch_start = time.time()
+            edit_outcomes = await asyncio.gather(
+                *(run_edit_task(request.sid, edit) for edit in edit_batch)
             )
-            edit_response = process_edit_request(edit_request)
+            total_agent_time += time.time() - batch_start
+            for agent_result, task_timing in edit_outcomes:
+                results.append(agent_result)
+                task_timings.append(task_timing)
+            idx = end
+            continue
 
-            agent_duration = time.time() - agent_start
+        logger.info(
+            "Processing task %d/%d - Step ID: %s, Type: %s",
+            idx + 1,
+            len(decide_responses),
+            step_id,
+            step_type,
+        )
 
-            agent_result = AgentResult(
-                session_id=edit_response.session_id,
-                step_id=edit_response.step_id,
-                intent=edit_response.intent,
-                context=edit_response.context,
-                result=edit_response.code,
-                agent_type="edit",
-                execution_time_seconds=round(agent_duration, 3),
-            )
-            results.append(agent_result)
-            task_timings.append(
-                {
-                    "step_id": step_id,
-                    "agent_type": "edit",
-                    "duration_seconds": round(agent_duration, 3),
-                }
-            )
-            logger.info(
-                f"EDIT agent completed for step: {step_id} in {agent_duration:.3f}s"
-            )
+        agent_start = time.time()
 
-        elif step_type == StepType.ACT:
-            logger.info(f"Routing to ACT agent for step: {step_id}")
+        if step_type == StepType.ACT:
+            logger.info("Routing to ACT agent for step: %s", step_id)
             action_request = ActionRequest(
                 session_id=request.sid, step_id=step_id, intent=intent, context=context
             )
@@ -140,11 +189,12 @@ async def execute_plan(request: PlanRequest) -> PlanResponse:
                 }
             )
             logger.info(
-                f"ACT agent completed for step: {step_id} in {agent_duration:.3f}s"
+                "ACT agent completed for step: %s in %.3fs", step_id, agent_duration
             )
+            total_agent_time += agent_duration
 
         elif step_type == StepType.CLARIFY:
-            logger.info(f"Routing to CLARIFY agent for step: {step_id}")
+            logger.info("Routing to CLARIFY agent for step: %s", step_id)
             clarify_request = ClarifyRequest(
                 session_id=request.sid, step_id=step_id, intent=intent, context=context
             )
@@ -170,15 +220,17 @@ async def execute_plan(request: PlanRequest) -> PlanResponse:
                 }
             )
             logger.info(
-                f"CLARIFY agent completed for step: {step_id} in {agent_duration:.3f}s"
+                "CLARIFY agent completed for step: %s in %.3fs", step_id, agent_duration
             )
+            total_agent_time += agent_duration
 
         else:
-            logger.warning(f"Unknown step_type: {step_type} for step: {step_id}")
+            logger.warning("Unknown step_type: %s for step: %s", step_type, step_id)
+
+        idx += 1
 
     # Calculate timing metadata
     overall_duration = time.time() - overall_start
-    total_agent_time = sum(t["duration_seconds"] for t in task_timings)
 
     timing_metadata = TimingMetadata(
         planner_time_seconds=round(planner_duration, 3),
@@ -189,7 +241,13 @@ async def execute_plan(request: PlanRequest) -> PlanResponse:
 
     response = PlanResponse(sid=request.sid, results=results, timing=timing_metadata)
     logger.info(
-        f"Plan execution completed for session: {request.sid} with {len(results)} result(s) in {overall_duration:.3f}s (planner: {planner_duration:.3f}s, agents: {total_agent_time:.3f}s)"
+        "Plan execution completed for session: %s with %d result(s) in %.3fs "
+        "(planner: %.3fs, agents: %.3fs)",
+        request.sid,
+        len(results),
+        overall_duration,
+        planner_duration,
+        total_agent_time,
     )
 
     return response
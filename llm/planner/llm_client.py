@@ -1,6 +1,9 @@
 from pathlib import Path
+from typing import Iterator
 import os
 import json
+import orjson
+from llm.answer import extract_json_payload
 from openai import OpenAI
 from dotenv import load_dotenv
 
@@ -10,32 +13,32 @@ MODEL_NAME = "MBZUAI-IFM/K2-Think"
 BASE_URL = "https://llm-api.k2think.ai/v1"
 
 
-def get_k2_client():
-    """Initialize and return K2 Think OpenAI client."""
-    api_key = os.getenv("K2_API_KEY")
-    if not api_key:
-        raise ValueError("K2_API_KEY not found in environment variables")
+_K2_CLIENT = None
 
-    import httpx
 
-    http_client = httpx.Client(timeout=1200.0)
+def get_k2_client():
+    """Get or create cached K2 Think OpenAI client."""
+    global _K2_CLIENT
+    if _K2_CLIENT is None:
+        api_key = os.getenv("K2_API_KEY")
+        if not api_key:
+            raise ValueError("K2_API_KEY not found in environment variables")
 
-    return OpenAI(
-        base_url=BASE_URL, api_key=api_key, http_client=http_client, max_retries=2
-    )
+        import httpx
 
+        # Reused across calls so the connection pool keeps TLS sessions alive
+        http_client = httpx.Client(timeout=1200.0)
 
-def split_tasks(user_text: str, previous_context: str = "") -> dict:
-    """
-    Split user request into multiple tasks if needed.
-    Returns dict with: tasks (list), context_summary (str)
-    """
-    client = get_k2_client()
+        _K2_CLIENT = OpenAI(
+            base_url=BASE_URL, api_key=api_key, http_client=http_client, max_retries=2
+        )
+    return _K2_CLIENT
 
-    needs_summary = len(previous_context) > 100
 
-    if needs_summary:
-        prompt = f"""You are a planner agent for a voice-first web development tool. Analyze the user's request and detect if it contains multiple tasks.
+def build_split_prompt(user_text: str, previous_context: str = "") -> str:
+    """Build the planner prompt that splits and classifies a user request."""
+    # Previous context is a sliding window of the last prompts, passed verbatim
+    return f"""You are a planner agent for a voice-first web development tool. Analyze the user's request and detect if it contains multiple tasks.
 
 User request: "{user_text}"
 
@@ -54,58 +57,6 @@ Your job:
    - "clarify" (need more information): vague or ambiguous requests
    IMPORTANT: If user is interacting with existing form fields/inputs (filling, typing, entering data), it's ALWAYS "act", NOT "edit"
 4. Add clear explanation for each task
-5. Provide a concise summary of the previous context (it's longer than 100 characters)
-
-**DEMO SCENARIO DETECTION:**
-If the user's request matches or is very similar to these demo phrases, classify and explain accordingly:
-1. Wake phrase: "Hey K2, lets build a website in under 2 minutes, are you ready?" or similar phrases about building website quickly and asking for readiness
-   - Classify as: "clarify"
-   - Explanation: "User is initiating demo sequence, requesting confirmation"
-2. Build request: mentions "build/create website" + "iPhone 17 Pro"
-   - Classify as: "act"
-   - Explanation: "User wants to start building iPhone 17 Pro website, should click Get Started button"
-3. Scroll request: "scroll to the bottom" or "scroll down"
-   - Classify as: "act"
-   - Explanation: "User wants to scroll down the page to see more content"
-4. Design inspection: mentions "design B/option B/second design" + "details/inspect/show me more"
-   - Classify as: "act"
-   - Explanation: "User wants to inspect design B template in detail"
-5. Pricing navigation: mentions "pricing" or "pricing tab/section/page"
-   - Classify as: "act"
-   - Explanation: "User wants to navigate to pricing section"
-Check for semantic similarity to these phrases, not exact matches.
-
-Respond with ONLY valid JSON in this exact format:
-{{
-    "tasks": [
-        {{
-            "text": "the task text",
-            "step_type": "edit" | "act" | "clarify",
-            "explanation": "detailed explanation for next agent"
-        }}
-    ],
-    "context_summary": "concise summary of previous context"
-}}
-
-If there's only one task, return a single-item array."""
-    else:
-        prompt = f"""You are a planner agent for a voice-first web development tool. Analyze the user's request and detect if it contains multiple tasks.
-
-User request: "{user_text}"
-
-Previous context (last 2 prompts): "{previous_context}"
-
-Your job:
-1. Detect if the request contains multiple distinct tasks (e.g., "scroll down, click submit, and make it orange" is 3 tasks)
-2. Split into individual tasks in chronological order
-3. For each task, classify as:
-   - "act" (perform action): ANY user interaction with existing UI elements
-     Examples: scroll, click, navigate, hover, **fill in form fields**, enter text, type, press keys, check boxes, submit forms, select dropdowns, etc.
-   - "edit" (modify website structure/style): changing the website code, design, or content
-     Examples: change colors, add new components, modify layout, style changes, create elements, etc.
-   - "clarify" (need more information): vague or ambiguous requests
-   IMPORTANT: If user is interacting with existing form fields/inputs (filling, typing, entering data), it's ALWAYS "act", NOT "edit"
-4. Add clear explanation for each task
 
 **DEMO SCENARIO DETECTION:**
 If the user's request matches or is very similar to these demo phrases, classify and explain accordingly:
@@ -139,27 +90,18 @@ Respond with ONLY valid JSON in this exact format:
 
 If there's only one task, return a single-item array."""
 
-    messages = [{"role": "user", "content": prompt}]
-
-    response = client.chat.completions.create(
-        model=MODEL_NAME, messages=messages, stream=False
-    )
-
-    content = response.choices[0].message.content.strip()
 
+def parse_split_response(content: str, user_text: str) -> dict:
+    """
+    Parse the planner LLM output into tasks.
+    Returns dict with: tasks (list), context_summary (str, always empty since
+    context is a sliding window of recent prompts rather than an LLM summary)
+    """
     # Parse response handling <think> and <answer> tags
     try:
-        if "<answer>" in content and "</answer>" in content:
-            content = content.split("<answer>")[1].split("</answer>")[0].strip()
-        elif "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
+        content = extract_json_payload(content)
 
-        result = json.loads(content)
-
-        if not needs_summary:
-            result["context_summary"] = ""
+        result = orjson.loads(content)
 
         return {
             "tasks": result.get(
@@ -172,7 +114,7 @@ If there's only one task, return a single-item array."""
                     }
                 ],
             ),
-            "context_summary": result.get("context_summary", ""),
+            "context_summary": "",
         }
     except (json.JSONDecodeError, IndexError) as e:
         # Fallback: treat as single task
@@ -187,6 +129,115 @@ If there's only one task, return a single-item array."""
             "context_summary": "",
         }
 
+
+class TaskStreamParser:
+    """
+    Incrementally extract complete task objects from a streamed planner answer.
+
+    Feed it content deltas; it returns each task object from the "tasks" array
+    inside <answer> as soon as the object's closing brace has arrived.
+    """
+
+    ANSWER_TAG = "<answer>"
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = None  # index of the next task in buffer once "tasks": [ is seen
+        self.done = False
+
+    def feed(self, text: str) -> list:
+        tasks = []
+        if self.done:
+            return tasks
+
+        self.buffer += text
+        if self.pos is None:
+            answer = self.buffer.find(self.ANSWER_TAG)
+            if answer == -1:
+                # Keep only enough to match a tag split across deltas
+                self.buffer = self.buffer[-(len(self.ANSWER_TAG) - 1):]
+                return tasks
+            self.buffer = self.buffer[answer:]
+            key = self.buffer.find('"tasks"')
+            bracket = self.buffer.find("[", key) if key != -1 else -1
+            if bracket == -1:
+                return tasks
+            self.pos = bracket + 1
+
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n,":
+                self.pos += 1
+            if self.pos >= len(self.buffer):
+                break
+            if self.buffer[self.pos] == "]":
+                self.done = True
+                break
+            try:
+                task, self.pos = _JSON_DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Task object not complete yet; wait for more content
+                break
+            if isinstance(task, dict):
+                tasks.append(task)
+
+        return tasks
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def stream_split_tasks(user_text: str, previous_context: str = "") -> Iterator[dict]:
+    """
+    Split user request into tasks, yielding each task as soon as the streamed
+    LLM output contains it. Falls back to parsing the full response when no
+    task could be extracted incrementally (e.g. the model omitted <answer>).
+    """
+    client = get_k2_client()
+
+    messages = [
+        {"role": "user", "content": build_split_prompt(user_text, previous_context)}
+    ]
+
+    stream = client.chat.completions.create(
+        model=MODEL_NAME, messages=messages, stream=True
+    )
+
+    parser = TaskStreamParser()
+    deltas = []
+    streamed_any = False
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content or ""
+        deltas.append(delta)
+        for task in parser.feed(delta):
+            streamed_any = True
+            yield task
+
+    if not streamed_any:
+        content = "".join(deltas).strip()
+        yield from parse_split_response(content, user_text)["tasks"]
+
+
+def split_tasks(user_text: str, previous_context: str = "") -> dict:
+    """
+    Split user request into multiple tasks if needed.
+    Returns dict with: tasks (list), context_summary (str)
+    """
+    client = get_k2_client()
+
+    messages = [
+        {"role": "user", "content": build_split_prompt(user_text, previous_context)}
+    ]
+
+    response = client.chat.completions.create(
+        model=MODEL_NAME, messages=messages, stream=False
+    )
+
+    content = response.choices[0].message.content.strip()
+
+    return parse_split_response(content, user_text)
+
     # def classify_intent(user_text: str, previous_context: str = "") -> dict:
     """
     Classify user intent and enrich with explanation.
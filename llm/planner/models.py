@@ -1,7 +1,10 @@
 from enum import Enum
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 
+# Response models are built once per task and only read afterwards
+RESPONSE_MODEL_CONFIG = ConfigDict(extra="forbid", frozen=True)
+
 
 class StepType(str, Enum):
     CLARIFY = "clarify"
@@ -16,10 +19,17 @@ class DecideRequest(BaseModel):
 
 
 class DecideResponse(BaseModel):
+    model_config = RESPONSE_MODEL_CONFIG
+
     step_id: str
     step_type: StepType
     intent: str
-    context: str
+    context: List[str]  # Previous prompts, oldest first
+
+    @property
+    def context_text(self) -> str:
+        """Context joined into the " | "-delimited form used by the agents."""
+        return " | ".join(self.context)
 
 
 class TaskItem(BaseModel):
@@ -77,6 +87,8 @@ class PlanRequest(BaseModel):
 class AgentResult(BaseModel):
     """Result from any agent (edit/act/clarify) in unified format."""
 
+    model_config = RESPONSE_MODEL_CONFIG
+
     session_id: str
     step_id: str
     intent: str
@@ -89,6 +101,8 @@ class AgentResult(BaseModel):
 class TimingMetadata(BaseModel):
     """Timing information for the orchestration pipeline."""
 
+    model_config = RESPONSE_MODEL_CONFIG
+
     planner_time_seconds: float
     total_agent_time_seconds: float
     total_time_seconds: float
@@ -98,6 +112,8 @@ class TimingMetadata(BaseModel):
 class PlanResponse(BaseModel):
     """Response from the plan orchestrator with all agent results."""
 
+    model_config = RESPONSE_MODEL_CONFIG
+
     sid: str
     results: List[AgentResult]
     timing: Optional[TimingMetadata] = None
@@ -0,0 +1,70 @@
+import copy
+import os
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+PLAN_CACHE_ENABLED = os.getenv("PLAN_CACHE_ENABLED", "").lower() in {"1", "true", "yes"}
+PLAN_CACHE_SIZE = int(os.getenv("PLAN_CACHE_SIZE", "256"))
+
+
+def normalize_prompt(text: str) -> str:
+    """
+    Collapse whitespace in a prompt. Case and punctuation are kept: they carry
+    literal content ("C++" vs "C#", "$5" vs "5%") that the task text echoes.
+    """
+    return " ".join(text.split())
+
+
+def cache_key(text: str, previous_context: str) -> Tuple[str, str]:
+    """
+    Key a task split on the prompt and the session context window the planner
+    saw, since the same prompt ("Red") can split differently after other prompts.
+    """
+    return normalize_prompt(text), previous_context
+
+
+class PlanCache:
+    """LRU cache of planner task splits keyed by prompt and session context."""
+
+    def __init__(self, max_size: int = PLAN_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries: "OrderedDict[Tuple[str, str], List[dict]]" = OrderedDict()
+
+    def get(self, text: str, previous_context: str) -> Optional[List[dict]]:
+        """Return a fresh copy of the cached tasks for this prompt and context, if any."""
+        key = cache_key(text, previous_context)
+        tasks = self.entries.get(key)
+        if tasks is None:
+            return None
+        self.entries.move_to_end(key)
+        return copy.deepcopy(tasks)
+
+    def put(self, text: str, previous_context: str, tasks: List[dict]):
+        """Store the task template, dropping session-specific fields."""
+        key = cache_key(text, previous_context)
+        self.entries[key] = [
+            {
+                "text": task["text"],
+                "step_type": task["step_type"],
+                "explanation": task["explanation"],
+            }
+            for task in tasks
+        ]
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+# Global plan cache instance
+_plan_cache = None
+
+
+def get_plan_cache() -> PlanCache:
+    """Get or create global plan cache instance."""
+    global _plan_cache
+    if _plan_cache is None:
+        _plan_cache = PlanCache()
+    return _plan_cache
@@ -1,16 +1,20 @@
-from typing import List
+import asyncio
+from typing import AsyncIterator, List
 from .models import DecideRequest, DecideResponse, StepType
-from .llm_client import split_tasks
+from .llm_client import split_tasks, stream_split_tasks
 from .session_manager import (
     get_previous_context,
+    get_previous_prompts,
     add_prompt_to_session,
     generate_step_id,
+    generate_step_ids,
 )
 from .queue_manager import get_queue_manager
+from .plan_cache import PLAN_CACHE_ENABLED, get_plan_cache
 
 
 async def process_single_task(
-    task: dict, sid: str, previous_context: str
+    task: dict, sid: str, previous_context: List[str]
 ) -> DecideResponse:
     """
     Process a single task and return DecideResponse.
@@ -18,11 +22,11 @@ async def process_single_task(
     Args:
         task: Dict with 'text', 'step_type', 'explanation'
         sid: Session ID
-        previous_context: Context from previous prompts
+        previous_context: Previous prompts, oldest first
     """
     step_id = task.get("step_id")
     if not step_id:
-        step_id = generate_step_id(sid)
+        step_id = generate_step_id()
         task["step_id"] = step_id
 
     intent = f"{task['text']} | {task['explanation']}"
@@ -46,6 +50,16 @@ async def process_single_task(
     return response
 
 
+def store_in_plan_cache(
+    plan_cache, text: str, previous_context: str, tasks: List[dict]
+):
+    """Cache a task split unless it is the fallback for unparseable LLM output."""
+    if not any(
+        task.get("explanation", "").startswith("Could not parse") for task in tasks
+    ):
+        plan_cache.put(text, previous_context, tasks)
+
+
 async def process_user_request(request: DecideRequest) -> List[DecideResponse]:
     """
     Process user request through the planner agent with queue support.
@@ -62,19 +76,28 @@ async def process_user_request(request: DecideRequest) -> List[DecideResponse]:
     #  split tasks called for all the requests, also if there is one step
     # Split the request into tasks (returns dict with tasks and context_summary)
     # handles both cases: one step and multiple steps
-    split_result = split_tasks(request.text, previous_context)
+    plan_cache = get_plan_cache() if PLAN_CACHE_ENABLED else None
+    cached_tasks = (
+        plan_cache.get(request.text, previous_context) if plan_cache else None
+    )
+    if cached_tasks is not None:
+        # Reuse the task split for a previously seen prompt in the same context
+        split_result = {"tasks": cached_tasks, "context_summary": ""}
+    else:
+        split_result = split_tasks(request.text, previous_context)
+        if plan_cache:
+            store_in_plan_cache(
+                plan_cache, request.text, previous_context, split_result["tasks"]
+            )
     tasks = split_result["tasks"]
 
     initial_step_id = request.step_id
+    new_step_ids = iter(generate_step_ids(len(tasks)))
     for index, task in enumerate(tasks):
         if index == 0 and initial_step_id:
             task["step_id"] = initial_step_id
         elif not task.get("step_id"):
-            task["step_id"] = generate_step_id(request.sid)
-    context_summary = split_result.get("context_summary", "")
-
-    # Use context_summary if available, otherwise use previous_context
-    # effective_context = context_summary if context_summary else previous_context
+            task["step_id"] = next(new_step_ids)
 
     # Get queue manager
     queue_manager = get_queue_manager()
@@ -84,13 +107,57 @@ async def process_user_request(request: DecideRequest) -> List[DecideResponse]:
 
     # sequentially process
     async def processor(task):
-        # Get updated context for this task
-        current_context = get_previous_context(request.sid)
-
-        if task == tasks[0] and context_summary:
-            return await process_single_task(task, request.sid, context_summary)
+        # Context is a sliding window over the most recent prompts in the session
+        current_context = get_previous_prompts(request.sid)
         return await process_single_task(task, request.sid, current_context)
 
     responses = await queue_manager.process_all_tasks(request.sid, processor)
 
     return responses
+
+
+async def stream_user_request(request: DecideRequest) -> AsyncIterator[DecideResponse]:
+    """
+    Streaming variant of process_user_request.
+
+    Each task is enqueued and processed as soon as the planner LLM has emitted
+    it, so the first DecideResponse is available before the full task split
+    has been generated.
+    """
+    previous_context = get_previous_context(request.sid)
+
+    plan_cache = get_plan_cache() if PLAN_CACHE_ENABLED else None
+    cached_tasks = (
+        plan_cache.get(request.text, previous_context) if plan_cache else None
+    )
+    if cached_tasks is not None:
+        task_iter = iter(cached_tasks)
+    else:
+        task_iter = stream_split_tasks(request.text, previous_context)
+
+    queue_manager = get_queue_manager()
+
+    async def processor(task):
+        current_context = get_previous_prompts(request.sid)
+        return await process_single_task(task, request.sid, current_context)
+
+    tasks = []
+    while True:
+        # The LLM stream is a blocking iterator; advance it off the event loop
+        task = await asyncio.to_thread(next, task_iter, None)
+        if task is None:
+            break
+
+        if not tasks and request.step_id:
+            task["step_id"] = request.step_id
+        elif not task.get("step_id"):
+            task["step_id"] = generate_step_id()
+        tasks.append(task)
+
+        await queue_manager.enqueue_tasks(request.sid, [task])
+        response = await queue_manager.process_next_task(request.sid, processor)
+        if response:
+            yield response
+
+    if plan_cache and cached_tasks is None and tasks:
+        store_in_plan_cache(plan_cache, request.text, previous_context, tasks)
@@ -2,9 +2,9 @@ import json
 import os
 import uuid
 from pathlib import Path
-from datetime import datetime
 
 SESSIONS_DIR = Path(__file__).resolve().parent / "sessions"
+CONTEXT_WINDOW = 2  # Number of recent prompts kept verbatim as context
 
 
 def ensure_sessions_dir():
@@ -38,35 +38,47 @@ def save_session(sid: str, data: dict):
         json.dump(data, f, indent=2)
 
 
-def get_previous_context(sid: str) -> str:
-    """Get last 2 prompts from session as concatenated string."""
+def get_previous_prompts(sid: str) -> list:
+    """Get last CONTEXT_WINDOW prompts from session, oldest first."""
     session = load_session(sid)
     prompts = session.get("prompts", [])
     
-    recent_prompts = prompts[-2:] if len(prompts) >= 2 else prompts
-    
-    context = " | ".join(recent_prompts)
-    return context
+    return prompts[-CONTEXT_WINDOW:]
+
+
+def get_previous_context(sid: str) -> str:
+    """Get last CONTEXT_WINDOW prompts from session as concatenated string."""
+    return " | ".join(get_previous_prompts(sid))
 
 
 def add_prompt_to_session(sid: str, text: str):
-    """Add new prompt to session history (keep only last 2)."""
+    """Add new prompt to session history (keep only last CONTEXT_WINDOW)."""
     session = load_session(sid)
     prompts = session.get("prompts", [])
     
     prompts.append(text)
     
-    prompts = prompts[-2:]
+    prompts = prompts[-CONTEXT_WINDOW:]
     
     session["prompts"] = prompts
     save_session(sid, session)
 
 
-def generate_step_id(sid: str) -> str:
-    """Generate unique step ID based on session ID and timestamp."""
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
-    
-    namespace = uuid.NAMESPACE_DNS
-    unique_id = uuid.uuid5(namespace, f"{sid}-{timestamp}")
-    return str(unique_id)
+def generate_step_ids(count: int) -> list:
+    """
+    Generate `count` unique random step IDs from a single urandom draw.
+
+    IDs are canonical version-4 UUID strings. Unlike timestamp-derived IDs,
+    steps created within the same microsecond can never collide.
+    """
+    random_bytes = os.urandom(16 * count)
+    return [
+        str(uuid.UUID(bytes=random_bytes[i:i + 16], version=4))
+        for i in range(0, 16 * count, 16)
+    ]
+
+
+def generate_step_id() -> str:
+    """Generate a unique step ID."""
+    return generate_step_ids(1)[0]
 
@@ -5,6 +5,7 @@ Executes tests in parallel sessions while maintaining sequential order within ea
 
 import asyncio
 import json
+import os
 import time
 from pathlib import Path
 from datetime import datetime
@@ -28,6 +29,9 @@ from llm.planner.tests.validator import run_all_validations, generate_session_su
 API_BASE_URL = "http://localhost:8000"
 RESULTS_DIR = Path(__file__).resolve().parent / "results"
 TIMEOUT = 120  # seconds per request
+# Max in-flight /decide requests, sized to the server's planner concurrency
+MAX_CONCURRENT_REQUESTS = int(os.getenv("PLANNER_TEST_CONCURRENCY", "8"))
+REQUEST_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
 
 def get_test_run_dir():
@@ -60,6 +64,12 @@ def ensure_results_dir():
     RESULTS_DIR.mkdir(exist_ok=True)
 
 
+def log_request_contention(session_id):
+    """Print how many request slots were free when a request failed."""
+    free_slots = REQUEST_SEMAPHORE._value
+    print(f"[{session_id}] Request failed with {free_slots}/{MAX_CONCURRENT_REQUESTS} request slots free")
+
+
 async def send_request(client, session_id, text, step_id):
     """Send single request to planner API."""
     url = f"{API_BASE_URL}/decide"
@@ -69,25 +79,29 @@ async def send_request(client, session_id, text, step_id):
         "step_id": step_id,
     }
     
-    try:
-        response = await client.post(url, json=payload, timeout=TIMEOUT)
-        response.raise_for_status()
-        result = response.json()
-        
-        # Handle list response (new format) - for single-task tests, return first item
-        if isinstance(result, list):
-            if len(result) > 0:
-                return result[0]
-            else:
-                return {"error": "Empty response list"}
-        
-        return result
-    except httpx.TimeoutException:
-        return {"error": "Request timeout"}
-    except httpx.HTTPStatusError as e:
-        return {"error": f"HTTP {e.response.status_code}: {e.response.text}"}
-    except Exception as e:
-        return {"error": str(e)}
+    async with REQUEST_SEMAPHORE:
+        try:
+            response = await client.post(url, json=payload, timeout=TIMEOUT)
+            response.raise_for_status()
+            result = response.json()
+            
+            # Handle list response (new format) - for single-task tests, return first item
+            if isinstance(result, list):
+                if len(result) > 0:
+                    return result[0]
+                else:
+                    return {"error": "Empty response list"}
+            
+            return result
+        except httpx.TimeoutException:
+            log_request_contention(session_id)
+            return {"error": "Request timeout"}
+        except httpx.HTTPStatusError as e:
+            log_request_contention(session_id)
+            return {"error": f"HTTP {e.response.status_code}: {e.response.text}"}
+        except Exception as e:
+            log_request_contention(session_id)
+            return {"error": str(e)}
 
 
 async def run_session_tests(session_id, client, run_dir):
@@ -96,7 +110,7 @@ async def run_session_tests(session_id, client, run_dir):
     
     tests = get_tests_by_session(session_id)
     results = []
-    all_step_ids = set()
+    session_step_ids = set()  # step IDs only need to be unique within a session
     session_prompts = []
     
     session_start = time.time()
@@ -136,7 +150,7 @@ async def run_session_tests(session_id, client, run_dir):
         else:
             # Run validations
             assertions, passed, errors = run_all_validations(
-                test, response, all_step_ids, session_prompts
+                test, response, session_step_ids, session_prompts
             )
             
             result = {
@@ -348,8 +362,22 @@ async def run_all_tests():
     return overall_summary
 
 
+def install_event_loop():
+    """Use uvloop for the asyncio event loop when it is available."""
+    try:
+        import uvloop
+    except ImportError:
+        # uvloop is not available on Windows; fall back to the default loop
+        return False
+
+    uvloop.install()
+    return True
+
+
 def main():
     """Main entry point."""
+    install_event_loop()
+
     try:
         summary = asyncio.run(run_all_tests())
         
@@ -3,6 +3,8 @@ Test case definitions for planner agent.
 30 test cases organized into 3 sessions for parallel execution.
 """
 
+from types import MappingProxyType
+
 TEST_SESSIONS = {
     "session-a": {
         "name": "Core Functionality & Edge Cases",
@@ -242,27 +244,37 @@ TEST_SESSIONS = {
 }
 
 
+# Alternative intents are only used for membership checks
+for session_data in TEST_SESSIONS.values():
+    for test in session_data["tests"]:
+        if "acceptable_intents" in test:
+            test["acceptable_intents"] = frozenset(test["acceptable_intents"])
+
+# Flattened views built once at import time; callers get immutable tuples
+_ALL_TESTS = tuple(
+    {**test, "session_id": session_id}
+    for session_id, session_data in TEST_SESSIONS.items()
+    for test in session_data["tests"]
+)
+_TESTS_BY_SESSION = MappingProxyType({
+    session_id: tuple(test for test in _ALL_TESTS if test["session_id"] == session_id)
+    for session_id in TEST_SESSIONS
+})
+_SESSION_IDS = tuple(TEST_SESSIONS)
+
+TEST_SESSIONS = MappingProxyType(TEST_SESSIONS)
+
+
 def get_all_tests():
     """Return all test cases with session IDs."""
-    all_tests = []
-    for session_id, session_data in TEST_SESSIONS.items():
-        for test in session_data["tests"]:
-            test["session_id"] = session_id
-            all_tests.append(test)
-    return all_tests
+    return _ALL_TESTS
 
 
 def get_tests_by_session(session_id):
     """Return tests for a specific session."""
-    if session_id in TEST_SESSIONS:
-        tests = TEST_SESSIONS[session_id]["tests"]
-        for test in tests:
-            test["session_id"] = session_id
-        return tests
-    return []
+    return _TESTS_BY_SESSION.get(session_id, ())
 
 
 def get_session_ids():
     """Return list of all session IDs."""
-    return list(TEST_SESSIONS.keys())
-
+    return list(_SESSION_IDS)
@@ -3,64 +3,65 @@ Validation logic for planner agent test results.
 Checks system behavior and LLM classification quality.
 """
 
-import uuid
+import functools
+import itertools
+import os
+import re
 import json
+from collections import Counter
 from pathlib import Path
 
 
+REQUIRED_FIELDS = ("step_id", "step_type", "intent", "context")
+VALID_STEP_TYPES = frozenset({"edit", "act", "clarify"})
+UUID_PATTERN = re.compile(
+    r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+)
+
+
 def validate_response_structure(response):
     """Validate response has required fields."""
-    required_fields = ["step_id", "step_type", "intent", "context"]
     assertions = {}
     
-    for field in required_fields:
+    for field in REQUIRED_FIELDS:
         assertions[f"has_{field}"] = field in response
     
     return assertions
 
 
 def validate_step_id(step_id):
-    """Validate step_id is a valid UUID."""
-    try:
-        uuid.UUID(step_id)
-        return True
-    except (ValueError, AttributeError):
-        return False
+    """Validate step_id is a UUID in canonical 8-4-4-4-12 hex form."""
+    return isinstance(step_id, str) and UUID_PATTERN.match(step_id) is not None
 
 
 def validate_step_type(step_type):
     """Validate step_type is one of: edit, act, clarify."""
-    valid_types = ["edit", "act", "clarify"]
-    return step_type in valid_types
+    return step_type in VALID_STEP_TYPES
 
 
-def validate_intent_format(intent):
-    """Validate intent contains user text and explanation separated by |."""
-    if not intent or not isinstance(intent, str):
-        return False
-    
-    # Check if it contains the separator
-    return " | " in intent and len(intent.split(" | ")) >= 2
+def _parse_intent(intent):
+    """
+    Validate intent format and explanation quality in a single pass.
 
+    Intent must contain user text and explanation separated by " | ", and the
+    explanation should be at least 10 characters.
 
-def validate_explanation_quality(intent):
-    """Check if explanation part is non-empty and meaningful."""
-    if not intent or " | " not in intent:
-        return False
-    
-    parts = intent.split(" | ", 1)
-    if len(parts) < 2:
-        return False
+    Returns:
+        (format_ok, explanation_ok)
+    """
+    if not intent or not isinstance(intent, str):
+        return False, False
     
-    explanation = parts[1].strip()
+    _, sep, explanation = intent.partition(" | ")
+    format_ok = bool(sep)
+    explanation_ok = format_ok and len(explanation.strip()) >= 10
     
-    # Explanation should be at least 10 characters
-    return len(explanation) >= 10
+    return format_ok, explanation_ok
 
 
 def validate_context_empty(context, should_be_empty):
     """Validate context is empty for first request."""
-    is_empty = context == "" or context is None
+    is_empty = not context
     return is_empty == should_be_empty
 
 
@@ -69,25 +70,29 @@ def validate_context_count(context, expected_count):
     if not context:
         return expected_count == 0
     
-    # Context is concatenated with " | " separator
-    prompts = context.split(" | ")
-    actual_count = len([p for p in prompts if p.strip()])
+    # Context is a list of previous prompts
+    actual_count = len([p for p in context if p.strip()])
     
     return actual_count == expected_count
 
 
-def validate_context_length(context, should_be_long):
-    """Validate context length for summarization trigger."""
+def validate_context_length(context, should_be_long, window=2):
+    """
+    Validate context is a verbatim sliding window of recent prompts.
+
+    Context is never summarized, so it holds at most `window` prompts and a
+    long prompt keeps its full length (>100 chars) once it enters the window.
+    """
+    prompts = [p for p in context if p.strip()] if context else []
+    if len(prompts) > window:
+        return False
     if should_be_long:
-        # Long context should be >100 chars
-        return len(context) > 100
-    else:
-        # Short context can be any length <=100
-        return True
+        return sum(len(p) for p in prompts) > 100
+    return True
 
 
 def validate_intent_classification(response, expected_intent, acceptable_intents=None):
-    """Validate LLM classified intent correctly."""
+    """Validate LLM classified intent correctly. acceptable_intents is a frozenset."""
     actual_intent = response.get("step_type", "")
     
     # Check if it matches expected
@@ -101,6 +106,16 @@ def validate_intent_classification(response, expected_intent, acceptable_intents
     return False
 
 
+@functools.lru_cache(maxsize=128)
+def _load_session(path_str, mtime_ns, size):
+    """
+    Parse a session file; (mtime_ns, size) keys the cache so edits are
+    re-read even when a rewrite lands within one coarse mtime tick.
+    """
+    with open(path_str, "r") as f:
+        return json.load(f)
+
+
 def validate_session_persistence(session_id, expected_prompts):
     """Validate session file contains correct prompts."""
     sessions_dir = Path(__file__).resolve().parent.parent / "sessions"
@@ -110,8 +125,8 @@ def validate_session_persistence(session_id, expected_prompts):
         return False
     
     try:
-        with open(session_file, "r") as f:
-            session_data = json.load(f)
+        stat = os.stat(session_file)
+        session_data = _load_session(str(session_file), stat.st_mtime_ns, stat.st_size)
         
         actual_prompts = session_data.get("prompts", [])
         
@@ -131,8 +146,14 @@ def validate_session_persistence(session_id, expected_prompts):
         return False
 
 
-def run_all_validations(test_case, response, all_step_ids, session_prompts):
-    """Run all validation checks for a test case."""
+def run_all_validations(test_case, response, session_step_ids, session_prompts):
+    """
+    Run all validation checks for a test case.
+
+    session_step_ids holds the step IDs already seen in this test's session and
+    is updated in place. Step IDs must be unique within a session; sessions
+    each own their set, so they never share state.
+    """
     assertions = {}
     errors = []
     
@@ -147,12 +168,12 @@ def run_all_validations(test_case, response, all_step_ids, session_prompts):
     step_id = response.get("step_id", "")
     assertions["valid_step_id_format"] = validate_step_id(step_id)
     
-    if step_id in all_step_ids:
+    if step_id in session_step_ids:
         assertions["step_id_unique"] = False
         errors.append(f"Duplicate step_id: {step_id}")
     else:
         assertions["step_id_unique"] = True
-        all_step_ids.add(step_id)
+        session_step_ids.add(step_id)
     
     # Step type validation
     step_type = response.get("step_type", "")
@@ -160,11 +181,12 @@ def run_all_validations(test_case, response, all_step_ids, session_prompts):
     
     # Intent format validation
     intent = response.get("intent", "")
-    assertions["valid_intent_format"] = validate_intent_format(intent)
-    assertions["explanation_quality"] = validate_explanation_quality(intent)
+    format_ok, explanation_ok = _parse_intent(intent)
+    assertions["valid_intent_format"] = format_ok
+    assertions["explanation_quality"] = explanation_ok
     
     # Context validation
-    context = response.get("context", "")
+    context = response.get("context", [])
     
     if test_case.get("expected_context_empty"):
         assertions["context_empty_correct"] = validate_context_empty(context, True)
@@ -186,22 +208,25 @@ def run_all_validations(test_case, response, all_step_ids, session_prompts):
         assertions["classification_correct"] = validate_intent_classification(response, expected, acceptable)
         
         if not assertions["classification_correct"]:
-            acceptable_str = f" or {acceptable}" if acceptable else ""
+            # acceptable_intents is a frozenset; sort it so messages are stable
+            acceptable_str = (
+                "".join(f" or '{intent}'" for intent in sorted(acceptable))
+                if acceptable
+                else ""
+            )
             errors.append(f"Expected intent '{expected}'{acceptable_str} but got '{step_type}'")
     
-    # Check if test passed (all critical assertions true)
-    critical_checks = [
-        "has_step_id",
-        "has_step_type",
-        "has_intent",
-        "has_context",
-        "valid_step_id_format",
-        "step_id_unique",
-        "valid_step_type",
-        "valid_intent_format"
-    ]
-    
-    passed = all(assertions.get(check, False) for check in critical_checks)
+    # Check if test passed (all critical assertions true, computed above)
+    passed = (
+        assertions["has_step_id"]
+        and assertions["has_step_type"]
+        and assertions["has_intent"]
+        and assertions["has_context"]
+        and assertions["valid_step_id_format"]
+        and assertions["step_id_unique"]
+        and assertions["valid_step_type"]
+        and assertions["valid_intent_format"]
+    )
     
     # Note: We don't fail on classification_correct since LLM might have valid reasons
     # to classify differently, but we track it
@@ -209,11 +234,25 @@ def run_all_validations(test_case, response, all_step_ids, session_prompts):
     return assertions, passed, errors
 
 
+def count_test_outcomes(tests):
+    """Tally pass/fail and classification outcomes for a list of test results."""
+    counts = Counter()
+    for t in tests:
+        counts["pass" if t.get("passed", False) else "fail"] += 1
+        assertions = t.get("assertions", {})
+        if "classification_correct" in assertions:
+            counts["classified"] += 1
+            if assertions["classification_correct"]:
+                counts["classified_correct"] += 1
+    return counts
+
+
 def generate_session_summary(session_id, tests, duration):
     """Generate summary report for a test session."""
+    counts = count_test_outcomes(tests)
     total = len(tests)
-    passed = sum(1 for t in tests if t.get("passed", False))
-    failed = total - passed
+    passed = counts["pass"]
+    failed = counts["fail"]
     
     summary = {
         "session_id": session_id,
@@ -230,20 +269,14 @@ def generate_session_summary(session_id, tests, duration):
 
 def generate_overall_summary(session_summaries, total_duration):
     """Generate overall summary across all sessions."""
-    total_tests = sum(s["total_tests"] for s in session_summaries)
-    total_passed = sum(s["passed"] for s in session_summaries)
-    total_failed = sum(s["failed"] for s in session_summaries)
-    
-    # Classification accuracy
-    classification_correct = 0
-    classification_total = 0
-    
-    for session in session_summaries:
-        for test in session["tests"]:
-            if "classification_correct" in test.get("assertions", {}):
-                classification_total += 1
-                if test["assertions"]["classification_correct"]:
-                    classification_correct += 1
+    total_passed = sum(session["passed"] for session in session_summaries)
+    total_failed = sum(session["failed"] for session in session_summaries)
+    total_tests = total_passed + total_failed
+    counts = count_test_outcomes(
+        itertools.chain.from_iterable(session["tests"] for session in session_summaries)
+    )
+    classification_correct = counts["classified_correct"]
+    classification_total = counts["classified"]
     
     summary = {
         "total_sessions": len(session_summaries),
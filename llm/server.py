@@ -1,16 +1,26 @@
 import asyncio
+import atexit
+import functools
+import hashlib
+import itertools
 import json
 import logging
 import os
+import queue
 import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from uuid import uuid4
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import orjson
 import websockets
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from llm.planner.models import (
     DecideRequest,
     DecideResponse,
@@ -18,23 +28,58 @@ from llm.planner.models import (
     PlanRequest,
     PlanResponse,
 )
-from llm.planner.planner import process_user_request
+from llm.planner.planner import process_user_request, stream_user_request
 from llm.planner.queue_manager import get_queue_manager
 from llm.clarifier.models import ClarifyRequest, ClarifyResponse
 from llm.clarifier.clarifier import process_clarification_request
 from llm.actor.models import ActionRequest, ActionResponse
 from llm.actor.actor import process_action_request
+from llm.actor.prompt_builder import get_system_prompt, get_system_prompt_parts
 from llm.editor.models import EditRequest, EditResponse
 from llm.editor.editor import process_edit_request
 from llm.orchestrator import execute_plan
 
-# Configure logging to output to stdout with proper formatting
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
-    force=True,  # Override any existing configuration
-)
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def create_queue_log_handler() -> logging.Handler:
+    """
+    Return a handler that queues records for a background thread, which
+    writes them to stdout, so request handlers never block on console I/O.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    listeners = []
+
+    def start_listener():
+        listeners[:] = [QueueListener(log_queue, stream_handler)]
+        listeners[0].start()
+
+    def stop_listener():
+        listeners[0].stop()
+
+    # Threads do not survive fork: drain the queue before forking so no
+    # record is written twice, then give each side its own listener. Only
+    # POSIX can fork; elsewhere there is nothing to restart.
+    start_listener()
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(
+            before=stop_listener,
+            after_in_parent=start_listener,
+            after_in_child=start_listener,
+        )
+    atexit.register(stop_listener)
+    queue_handler = QueueHandler(log_queue)
+    # Only merge args into the message here; the listener applies LOG_FORMAT
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    return queue_handler
+
+
+# Configure logging once per process; uvicorn is started with log_config=None
+# so its loggers propagate here instead of installing a second stdout handler
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO, handlers=[create_queue_log_handler()])
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
@@ -46,6 +91,8 @@ load_dotenv(REPO_ROOT / ".env")
 load_dotenv(BASE_DIR / ".env", override=True)
 
 
+# Log previews of repeated prompts are reused instead of re-condensed
+@functools.lru_cache(maxsize=512)
 def _preview(text: Optional[str], length: int = 160) -> str:
     if not text:
         return ""
@@ -73,6 +120,19 @@ LLM_SERVER_HOST = os.getenv("LLM_SERVER_HOST", "0.0.0.0")
 LLM_SERVER_PORT = get_env_int("LLM_SERVER_PORT", 8000)
 EXECUTOR_SERVER_HOST = os.getenv("EXECUTOR_SERVER_HOST", "0.0.0.0")
 EXECUTOR_SERVER_PORT = get_env_int("EXECUTOR_SERVER_PORT", 8100)
+# Session queues and caches live in process memory, so keep a single worker
+# unless requests for one session are guaranteed to reach the same process
+LLM_SERVER_WORKERS = get_env_int("LLM_SERVER_WORKERS", 1)
+
+# Comma-separated origins; "*" keeps the open dev setup, without credentials
+CORS_ALLOW_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ALLOW_ORIGINS", "*").split(",")
+    if origin.strip()
+]
+CORS_ALLOW_CREDENTIALS = "*" not in CORS_ALLOW_ORIGINS
+CORS_ALLOW_METHODS = ["GET", "POST"]
+CORS_ALLOW_HEADERS = ["Content-Type", "Authorization"]
 
 
 # ============================================================================
@@ -80,406 +140,56 @@ EXECUTOR_SERVER_PORT = get_env_int("EXECUTOR_SERVER_PORT", 8100)
 # ============================================================================
 
 
-def build_dynamic_sitemap(dom_snapshot: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Build dynamic sitemap from DOM snapshot.
-    Ported from llmAgent.js - maintains exact same logic.
-    """
-    sitemap = {
-        "mainApp": {"sections": [], "elements": [], "navLinks": []},
-        "iframe": {"sections": [], "elements": [], "navLinks": []},
-    }
+SYSTEM_PROMPT_CACHE_SIZE = 8
 
-    elements = dom_snapshot.get("elements", [])
-
-    for el in elements:
-        context = el.get("context", "main-app")
-        target = sitemap["iframe"] if context == "iframe" else sitemap["mainApp"]
-        nav_id = el.get("navId", "")
-
-        if "-section" in nav_id:
-            target["sections"].append(
-                {
-                    "id": nav_id,
-                    "text": el.get("text", "")[:40],
-                    "visible": el.get("isVisible", False),
-                }
-            )
-        elif nav_id.startswith("nav-") and el.get("tagName") == "a":
-            target["navLinks"].append(
-                {
-                    "id": nav_id,
-                    "text": el.get("text", ""),
-                    "href": el.get("href", "unknown"),
-                }
-            )
-        else:
-            target["elements"].append(
-                {
-                    "id": nav_id,
-                    "type": el.get("tagName", ""),
-                    "text": el.get("text", "")[:40],
-                    "visible": el.get("isVisible", False),
-                }
-            )
-
-    return sitemap
-
-
-def get_system_prompt(dom_snapshot: Dict[str, Any]) -> str:
-    """
-    Generate system prompt for LLM agent.
-    Ported from llmAgent.js - maintains exact same logic and text.
-    """
-    sitemap = build_dynamic_sitemap(dom_snapshot)
+# Recent prompts keyed by a digest of the snapshot they were built from
+_system_prompt_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_system_prompt_parts_cache: "OrderedDict[bytes, Tuple[str, str]]" = OrderedDict()
 
-    main_app_sections = sitemap["mainApp"]["sections"]
-    main_app_sections_str = (
-        "\n".join([f"  - {s['id']}: {s['text']}" for s in main_app_sections])
-        or "  (none)"
-    )
 
-    main_app_elements = [
-        el
-        for el in sitemap["mainApp"]["elements"]
-        if "-section" not in el["id"] and not el["id"].startswith("nav-")
-    ]
-    main_app_elements_str = (
-        "\n".join(
-            [
-                f"  - {el['id']}: {el['type']} \"{el['text']}\""
-                for el in main_app_elements
-            ]
-        )
-        or "  (none)"
-    )
+def _get_cached_for_snapshot(
+    cache: OrderedDict,
+    build: Callable[[Dict[str, Any]], Any],
+    dom_snapshot: Dict[str, Any],
+    snapshot_json: Optional[bytes] = None,
+) -> Any:
+    """Return build(dom_snapshot), reusing the result for an identical snapshot."""
+    if snapshot_json is None:
+        snapshot_json = orjson.dumps(dom_snapshot, option=orjson.OPT_SORT_KEYS)
+    key = hashlib.blake2b(snapshot_json, digest_size=16).digest()
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+        return value
 
-    nav_links = sitemap["mainApp"]["navLinks"]
-    nav_links_str = (
-        "\n".join([f"  - {link['id']}: \"{link['text']}\"" for link in nav_links])
-        or "  (none)"
-    )
+    value = build(dom_snapshot)
+    cache[key] = value
+    if len(cache) > SYSTEM_PROMPT_CACHE_SIZE:
+        cache.popitem(last=False)
+    return value
 
-    iframe_nav_links = sitemap["iframe"]["navLinks"]
-    iframe_nav_links_str = (
-        "\n".join(
-            [f"  - {link['id']}: \"{link['text']}\"" for link in iframe_nav_links]
-        )
-        or "  (none)"
-    )
 
-    iframe_elements = sitemap["iframe"]["elements"]
-    iframe_elements_str = (
-        "\n".join(
-            [f"  - {el['id']}: {el['type']} \"{el['text']}\"" for el in iframe_elements]
-        )
-        or "  (empty - no user-generated content yet)"
+def get_cached_system_prompt(
+    dom_snapshot: Dict[str, Any], snapshot_json: Optional[bytes] = None
+) -> str:
+    """
+    Return the system prompt for a snapshot, reusing the last result when the
+    frontend sends an identical snapshot again (e.g. while polling an idle page).
+    snapshot_json may pass in the snapshot already serialized with sorted keys.
+    """
+    return _get_cached_for_snapshot(
+        _system_prompt_cache, get_system_prompt, dom_snapshot, snapshot_json
     )
 
-    elements = dom_snapshot.get("elements", [])
-    current_page_elements = []
-    for el in elements:
-        if el.get("isVisible", False):
-            position = el.get("position", {})
-            in_viewport = (
-                "✓ visible" if position.get("isInViewport", False) else "⌛ off-screen"
-            )
-            context = "[iframe]" if el.get("context") == "iframe" else "[main]"
-            text = el.get("text", "")[:50]
-            current_page_elements.append(
-                f"- {context} {el.get('navId', '')}: {el.get('tagName', '')} [{in_viewport}] \"{text}\""
-            )
-    current_page_elements_str = "\n".join(current_page_elements)
-
-    total_elements = dom_snapshot.get("totalElementCount", 0)
-    main_app_count = len([el for el in elements if el.get("context") == "main-app"])
-    iframe_count = dom_snapshot.get("iframeElementCount", 0)
-
-    active_iframe = dom_snapshot.get("activeIframe")
-    active_iframe_info = ""
-    if active_iframe:
-        mode = active_iframe.get("mode", "unknown")
-        template_id = active_iframe.get("templateId", "unknown")
-        edit_mode = active_iframe.get("editMode", False)
-        active_iframe_info = f"\n**Active iframe:** Template {template_id} - {mode} mode (editMode: {edit_mode})"
-
-    system_prompt = f"""You are a navigation assistant for a website with TWO contexts:
-    1. Main App (static navigation and pages)
-    2. Dynamic iframe (user-generated content in canvas)
-
-    **Current Page:** {dom_snapshot.get('currentUrl', '/')}
-    **Viewport:** Height={dom_snapshot.get('viewportHeight', 0)}px, Scroll={dom_snapshot.get('scrollY', 0)}px{active_iframe_info}
-
-    **DEMO SCENARIOS - PRIORITY INSTRUCTIONS:**
-    If the user's intent matches these demo scenarios, follow these EXACT actions:
-
-    1. Build iPhone 17 Pro website:
-       - Keywords: "build", "create", "website", "iPhone 17 Pro", "get started"
-       - Action: {{"action": "navigate", "targetId": "create-project-cta", "reasoning": "Starting iPhone 17 Pro website creation"}}
-
-    2. Scroll to bottom:
-       - Keywords: "scroll", "bottom", "scroll down", "scroll to the bottom"
-       - Action: {{"action": "scroll", "direction": "down", "amount": 9999, "reasoning": "Scrolling to bottom of page"}}
-
-    3. Inspect Design B:
-       - Keywords: "design B", "option B", "second design/template", "details", "inspect", "show me more"
-       - Action: {{"action": "navigate", "targetId": "template-option-b", "reasoning": "Opening design B for detailed inspection"}}
-
-    4. Navigate to Pricing:
-       - Keywords: "pricing", "price", "pricing tab/section/page"
-       - Action: Look for navigation elements with "pricing" in their id or text
-       - If in iframe, look for: nav links with "pricing" or elements containing "pricing"
-       - Action: {{"action": "navigate", "targetId": "[pricing-nav-id]", "reasoning": "Navigating to pricing section"}}
-
-    These demo scenarios take PRIORITY. If the user's intent semantically matches these patterns, use the specified actions.
-
-    **DYNAMIC SITE MAP:**
-
-    Main App Navigation Links:
-    {nav_links_str}
-
-    iframe Navigation Links:
-    {iframe_nav_links_str}
-
-    Main App Sections:
-    {main_app_sections_str}
-
-    Main App Interactive Elements:
-    {main_app_elements_str}
-
-    iframe Canvas Elements (dynamic user-generated content):
-    {iframe_elements_str}
-
-    **Element Counts:**
-    - Total Elements: {total_elements}
-    - Main App: {main_app_count}
-    - iframe: {iframe_count}
-
-    **Elements Currently Visible (detailed view):**
-    {current_page_elements_str}
-
-    **Your Task:**
-    Analyze the user's command and respond with ONLY valid JSON - either a SINGLE action or an ARRAY of actions for multi-step commands.
-
-    **Available Actions:**
-
-    1. Navigate (click ANY element - links, buttons, nav items, etc.):
-    {{
-    "action": "navigate",
-    "targetId": "nav-about-link",
-    "reasoning": "User wants to go to About page"
-    }}
-    IMPORTANT: Use "navigate" action for ALL clicks, including buttons. There is NO "click" action type.
-
-    2. Scroll (general page scrolling):
-    {{
-    "action": "scroll",
-    "direction": "up|down|top|bottom",
-    "amount": 500,
-    "reasoning": "User wants to scroll down"
-    }}
-
-    3. ScrollToElement (scroll to a specific section - PHASE 2 NEW):
-    {{
-    "action": "scrollToElement",
-    "targetId": "testimonials-section",
-    "reasoning": "User wants to see testimonials section"
-    }}
-
-    4. Wait (pause between actions - PHASE 2):
-    {{
-    "action": "wait",
-    "duration": 500,
-    "reasoning": "Wait for navigation to complete"
-    }}
-
-    5. Type (enter text into input field - PHASE 4 NEW):
-    {{
-    "action": "type",
-    "targetId": "name-input",
-    "text": "John Doe",
-    "reasoning": "User wants to fill name field"
-    }}
-
-    6. Focus (focus on input field - PHASE 4 NEW):
-    {{
-    "action": "focus",
-    "targetId": "email-input",
-    "reasoning": "Focus on email field"
-    }}
-
-    7. Submit (submit a form - PHASE 4 NEW):
-    {{
-    "action": "submit",
-    "targetId": "contact-form",
-    "reasoning": "User wants to submit the form"
-    }}
-
-    8. Clear (clear an input field - PHASE 4):
-    {{
-    "action": "clear",
-    "targetId": "message-input",
-    "reasoning": "Clear the message field"
-    }}
-
-    9. Undo (reverse last action - PHASE 5 NEW):
-    {{
-    "action": "undo",
-    "reasoning": "User wants to undo the last action"
-    }}
-
-    10. Redo (redo undone action - PHASE 5 NEW):
-    {{
-    "action": "redo",
-    "reasoning": "User wants to redo the undone action"
-    }}
-
-    11. Error (cannot fulfill request):
-    {{
-    "action": "error",
-    "message": "I cannot find that element on this page",
-    "reasoning": "No matching element found"
-    }}
-
-    **Multi-Step Actions (PHASE 2):**
-    For complex commands that require multiple steps, return an ARRAY of actions:
-
-    Example 1: User on /about, says "Show me the testimonials"
-    [
-    {{
-        "action": "navigate",
-        "targetId": "nav-home-link",
-        "reasoning": "Testimonials are on home page, need to navigate there first"
-    }},
-    {{
-        "action": "wait",
-        "duration": 500,
-        "reasoning": "Wait for page to load"
-    }},
-    {{
-        "action": "scrollToElement",
-        "targetId": "testimonials-section",
-        "reasoning": "Scroll to testimonials section"
-    }}
-    ]
-
-    Example 2: User on / (home), says "Show me the testimonials"
-    {{
-    "action": "scrollToElement",
-    "targetId": "testimonials-section",
-    "reasoning": "Already on home page, just scroll to testimonials"
-    }}
-
-    Example 3: User on /contact, says "Go to the roadmap"
-    [
-    {{
-        "action": "navigate",
-        "targetId": "nav-about-link",
-        "reasoning": "Roadmap is on about page, need to navigate there first"
-    }},
-    {{
-        "action": "wait",
-        "duration": 500,
-        "reasoning": "Wait for page to load"
-    }},
-    {{
-        "action": "scrollToElement",
-        "targetId": "roadmap-section",
-        "reasoning": "Scroll to roadmap section"
-    }}
-    ]
-
-    **Form Filling (PHASE 4):**
-    For form-related commands, use type, focus, submit, or clear actions:
-
-    Example 4: User says "Fill the name field with John Smith"
-    {{
-    "action": "type",
-    "targetId": "name-input",
-    "text": "John Smith",
-    "reasoning": "User wants to enter name"
-    }}
-
-    Example 5: User says "Fill the contact form with name John and email john@example.com"
-    [
-    {{
-        "action": "navigate",
-        "targetId": "nav-contact-link",
-        "reasoning": "Navigate to contact page first"
-    }},
-    {{
-        "action": "wait",
-        "duration": 500,
-        "reasoning": "Wait for page load"
-    }},
-    {{
-        "action": "type",
-        "targetId": "name-input",
-        "text": "John",
-        "reasoning": "Fill name field"
-    }},
-    {{
-        "action": "type",
-        "targetId": "email-input",
-        "text": "john@example.com",
-        "reasoning": "Fill email field"
-    }}
-    ]
-
-    Example 6: User says "Submit the form"
-    {{
-    "action": "submit",
-    "targetId": "contact-form",
-    "reasoning": "User wants to submit the form"
-    }}
-
-    **Rules:**
-    - ONLY output valid JSON, nothing else
-    - For simple commands (e.g., "go to about"), use a SINGLE action object
-    - For complex commands (e.g., "show me testimonials", "go to roadmap"), use an ARRAY of actions
-    - **CRITICAL - iframe Elements**: Elements with IDs starting with "external-" are in the dynamic iframe canvas
-    - **CRITICAL - iframe Elements**: "external-create-btn" creates new buttons in the iframe canvas
-    - **CRITICAL - iframe Elements**: "external-btn-*" are dynamically created buttons (e.g., "external-btn-1", "external-btn-2")
-    - **CRITICAL**: Check the Site Map to know which context (main app vs iframe) has which elements
-    - **CRITICAL**: Always add a "wait" (500ms) action between navigation and scrolling
-    - Choose the MOST appropriate element based on semantic meaning
-    - Section elements end with "-section" (e.g., "testimonials-section", "roadmap-section")
-    - Navigation links are "nav-*-link" (e.g., "nav-home-link", "nav-about-link", "nav-contact-link", "nav-editor-link")
-    - Use "scrollToElement" when the target is a section on a page
-    - Be intelligent about spatial references
-    - If the user is already on the right page, don't navigate - just scroll directly
-    - **Form fields** (Phase 4): Input fields end with "-input" (e.g., "name-input", "email-input", "message-input")
-    - **Forms**: Forms end with "-form" (e.g., "contact-form")
-    - **Buttons**: Submit buttons end with "-button" (e.g., "submit-button")
-    - When filling forms, use "type" action for each field, don't navigate unless needed
-    - Always extract the actual text/value the user wants to enter (e.g., "fill name with John" → text: "John")
-    - For multi-field forms, create a sequence of "type" actions
-    - Users may say "enter", "fill", "type", or "put" - all mean the same thing
-    - **Undo/Redo** (Phase 5): Users may say "undo", "go back", "undo that" for undo, or "redo", "do that again" for redo
-    - Undo/redo don't need targetId, just set the action type
-    - **iframe Canvas Actions**: When user says "click the create button", use action "navigate" with targetId "external-create-btn"
-    - **iframe Canvas Actions**: When user says "click button 1", use action "navigate" with targetId "external-btn-{{number}}"
-    - **iframe Navigation Links**: Navigation links inside the iframe (including IDs starting with "nav-") are valid targets—use the "navigate" action instead of returning an error.
-    - **iframe Availability**: If an element exists in the iframe, prefer acting on it rather than returning the "error" action; only use "error" when no suitable element exists in either context.
-    - **iframe Picture Dropdown Workflow**:
-    - "Show me pictures" or "What pictures are available" → navigate to "external-show-pictures-btn" (opens dropdown)
-    - "Select tiger" (when dropdown is open) → navigate to "picture-tiger"
-    - "Select deer and lion" → sequence: navigate "picture-deer", wait 200ms, navigate "picture-lion"
-    - "Add to canvas" or "Add them" → navigate to "external-add-pictures-btn" (adds selected pictures and closes dropdown)
-    - "Close" or "Cancel" → navigate to "external-close-dropdown-btn" or "external-cancel-pictures-btn"
-    - Picture IDs: picture-tiger, picture-deer, picture-cougar, picture-stag, picture-zebra, picture-jaguar, picture-squirrel, picture-lion
-    - **CRITICAL**: NEVER use action type "click" - always use "navigate" for clicking ANY element (buttons, links, nav items, etc.)
-    - If uncertain about which context has an element, check the dynamic site map above
-
-    **Picture Workflow Examples:**
-    - "Show me available pictures" → navigate to "external-show-pictures-btn"
-    - "Show pictures and select the tiger" → sequence: navigate "external-show-pictures-btn", wait 500ms, navigate "picture-tiger"
-    - "Select tiger and deer then add to canvas" → sequence: navigate "picture-tiger", wait 200ms, navigate "picture-deer", wait 200ms, navigate "external-add-pictures-btn"
-    - "Close the picture menu" → navigate to "external-close-dropdown-btn"
-
-    User Command: """
-
-    return system_prompt
+
+def get_cached_system_prompt_parts(dom_snapshot: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Return the actor's (system prompt, page context) for a snapshot, reusing
+    them across steps that run against an unchanged page.
+    """
+    return _get_cached_for_snapshot(
+        _system_prompt_parts_cache, get_system_prompt_parts, dom_snapshot
+    )
 
 
 def resolve_dom_snapshot_ws_url() -> str:
@@ -503,21 +213,188 @@ def resolve_dom_snapshot_ws_url() -> str:
     return f"{scheme}://{host}{path}"
 
 
-DOM_SNAPSHOT_WS_URL_DEFAULT = resolve_dom_snapshot_ws_url()
-DOM_SNAPSHOT_REQUEST_TIMEOUT_DEFAULT = float(
-    os.getenv("DOM_SNAPSHOT_REQUEST_TIMEOUT", "10")
-)
+@dataclass(frozen=True)
+class DomSnapshotWsSettings:
+    url: str
+    timeout: float
+    # UNIX domain socket of a collocated bridge, used instead of TCP for url
+    unix_socket: Optional[str] = None
+
+
+@functools.cache
+def get_dom_snapshot_ws_settings() -> DomSnapshotWsSettings:
+    """
+    Resolve the websocket bridge settings from the environment once.
+    Call get_dom_snapshot_ws_settings.cache_clear() to re-read them.
+    """
+    ipc = os.getenv("DOM_SNAPSHOT_IPC", "")
+    return DomSnapshotWsSettings(
+        url=resolve_dom_snapshot_ws_url(),
+        timeout=float(os.getenv("DOM_SNAPSHOT_REQUEST_TIMEOUT", "10")),
+        unix_socket=ipc[len("unix:"):] if ipc.startswith("unix:") else None,
+    )
+
+
+DOM_SNAPSHOT_WS_CONNECT_ATTEMPTS = 3
+DOM_SNAPSHOT_WS_BACKOFF_SECONDS = 0.1
+
+
+_WS_REGISTER_MESSAGE = orjson.dumps({"type": "register", "role": "backend"}).decode()
+
+
+class _WsClient:
+    """
+    Long-lived backend connection to the frontend websocket bridge.
+
+    Requests are multiplexed over one socket: each carries a requestId and a
+    background reader resolves the matching future when the bridge replies.
+    """
+
+    def __init__(self, ws_url: str, unix_socket: Optional[str] = None):
+        self.ws_url = ws_url
+        self.unix_socket = unix_socket
+        self.loop = asyncio.get_running_loop()
+        self.websocket = None
+        self.reader: Optional[asyncio.Task] = None
+        self.pending: Dict[str, asyncio.Future] = {}
+        self.connect_lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self.reader is not None and not self.reader.done()
+
+    async def connect(self):
+        async with self.connect_lock:
+            if self.connected:
+                return
+
+            delay = DOM_SNAPSHOT_WS_BACKOFF_SECONDS
+            for attempt in range(1, DOM_SNAPSHOT_WS_CONNECT_ATTEMPTS + 1):
+                try:
+                    if self.unix_socket:
+                        self.websocket = await websockets.unix_connect(
+                            self.unix_socket, uri=self.ws_url, ping_interval=None
+                        )
+                    else:
+                        self.websocket = await websockets.connect(
+                            self.ws_url, ping_interval=None
+                        )
+                    break
+                except OSError:
+                    if attempt == DOM_SNAPSHOT_WS_CONNECT_ATTEMPTS:
+                        raise
+                    await asyncio.sleep(delay)
+                    delay *= 2
+
+            await self.websocket.send(_WS_REGISTER_MESSAGE)
+            self.reader = asyncio.create_task(self._reader_loop(self.websocket))
+
+    async def _reader_loop(self, websocket):
+        try:
+            async for raw_message in websocket:
+                try:
+                    message = orjson.loads(raw_message)
+                except orjson.JSONDecodeError:
+                    continue
+
+                future = self.pending.get(message.get("requestId"))
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except Exception as exc:
+            logger.warning("DOM snapshot websocket reader stopped: %s", exc)
+        finally:
+            # Fail outstanding requests so callers don't wait for their timeout.
+            # Futures of cancelled or answered requests are done (cancelled
+            # counts as done) and are skipped, so no exception is left unretrieved.
+            for future in list(self.pending.values()):
+                if future.done():
+                    continue
+                future.set_exception(OSError(f"connection to {self.ws_url} closed"))
+
+    async def request(
+        self, payload: Dict[str, Any], request_id: str, timeout: float
+    ) -> Dict[str, Any]:
+        """Send a payload and wait for the bridge message with the same requestId."""
+        for attempt in (1, 2):
+            await self.connect()
+            future = self.loop.create_future()
+            self.pending[request_id] = future
+            try:
+                # The bridge only accepts text frames, so send str not bytes
+                await self.websocket.send(orjson.dumps(payload).decode())
+                break
+            except websockets.ConnectionClosed:
+                # Stale connection: drop it and resend once on a fresh one
+                self.pending.pop(request_id, None)
+                await self.websocket.close()
+                await asyncio.gather(self.reader, return_exceptions=True)
+                if future.done():
+                    future.exception()
+                if attempt == 2:
+                    raise OSError(f"connection to {self.ws_url} closed")
+            except BaseException:
+                # Cancelled or failed before waiting: nobody will await this
+                # future, so cancel it rather than let the reader fail it later
+                self.pending.pop(request_id, None)
+                future.cancel()
+                raise
+
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self.pending.pop(request_id, None)
+
+
+# requestIds only need to be unique among in-flight bridge requests. The
+# bridge keeps one table for all backends, so the prefix combines the PID
+# with a random part and is regenerated in forked children.
+def _reset_request_ids():
+    global _request_id_prefix, _request_id_counter
+    _request_id_prefix = f"{os.getpid():x}-{os.urandom(4).hex()}-"
+    _request_id_counter = itertools.count()
+
+
+_reset_request_ids()
+# fork only exists on POSIX; spawned processes re-import and reset anyway
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_request_ids)
+
+
+def next_request_id() -> str:
+    """Return a process-unique correlation id for a bridge request."""
+    return _request_id_prefix + format(next(_request_id_counter), "x")
+
+
+# One pooled connection per bridge URL
+_WS_POOL: Dict[str, _WsClient] = {}
+
+
+async def get_ws_client(ws_url: str) -> _WsClient:
+    """Get or create the pooled bridge connection for ws_url."""
+    client = _WS_POOL.get(ws_url)
+    # Connections are bound to the event loop that created them
+    if client is None or client.loop is not asyncio.get_running_loop():
+        settings = get_dom_snapshot_ws_settings()
+        # Only the configured bridge is reachable over the UNIX socket
+        unix_socket = settings.unix_socket if ws_url == settings.url else None
+        client = _WsClient(ws_url, unix_socket)
+        _WS_POOL[ws_url] = client
+    await client.connect()
+    return client
 
 
 async def fetch_dom_snapshot(
-    ws_url: str = DOM_SNAPSHOT_WS_URL_DEFAULT,
-    timeout: float = DOM_SNAPSHOT_REQUEST_TIMEOUT_DEFAULT,
+    ws_url: Optional[str] = None,
+    timeout: Optional[float] = None,
     target_client_id: Optional[str] = None,
 ) -> dict:
     """
     Request a DOM snapshot from the frontend websocket bridge.
     """
-    request_id = str(uuid4())
+    settings = get_dom_snapshot_ws_settings()
+    ws_url = ws_url or settings.url
+    timeout = timeout or settings.timeout
+    request_id = next_request_id()
     request_payload = {
         "type": "get_dom_snapshot",
         "requestId": request_id,
@@ -526,34 +403,8 @@ async def fetch_dom_snapshot(
         request_payload["targetClientId"] = target_client_id
 
     try:
-        async with websockets.connect(ws_url, ping_interval=None) as websocket:
-            await websocket.send(json.dumps({"type": "register", "role": "backend"}))
-            await websocket.send(json.dumps(request_payload))
-
-            while True:
-                raw_message = await asyncio.wait_for(websocket.recv(), timeout=timeout)
-                try:
-                    message = json.loads(raw_message)
-                except json.JSONDecodeError:
-                    continue
-
-                message_type = message.get("type")
-                message_request_id = message.get("requestId")
-
-                if message_type == "dom_snapshot_response" and message_request_id in {
-                    None,
-                    request_id,
-                }:
-                    if message.get("error"):
-                        raise RuntimeError(message["error"])
-                    return message
-
-                if message_type == "dom_snapshot_error" and message_request_id in {
-                    None,
-                    request_id,
-                }:
-                    raise RuntimeError(message.get("error") or "DOM snapshot error")
-
+        client = await get_ws_client(ws_url)
+        message = await client.request(request_payload, request_id, timeout)
     except asyncio.TimeoutError as exc:
         raise RuntimeError(
             f"Timed out waiting for DOM snapshot response after {timeout} seconds"
@@ -563,16 +414,88 @@ async def fetch_dom_snapshot(
             f"Unable to connect to DOM snapshot websocket at {ws_url}: {exc}"
         ) from exc
 
+    message_type = message.get("type")
+    if message_type == "dom_snapshot_response":
+        if message.get("error"):
+            raise RuntimeError(message["error"])
+        return message
+
+    raise RuntimeError(message.get("error") or "DOM snapshot error")
+
+
+# TTS messages queued within this window are sent to the bridge as one batch
+TTS_BATCH_WINDOW_SECONDS = 0.02
+TTS_BATCH_MAX_MESSAGES = 32
+
+_tts_queue: Optional[asyncio.Queue] = None
+_tts_worker_task: Optional[asyncio.Task] = None
+
+
+async def _send_tts_batch(ws_url: str, messages: List[Dict[str, Any]]) -> None:
+    request_id = next_request_id()
+    payload = {"type": "tts_batch", "requestId": request_id, "messages": messages}
+    try:
+        client = await get_ws_client(ws_url)
+        # Best-effort wait for the bridge acknowledgement
+        try:
+            await client.request(payload, request_id, timeout=1.0)
+        except asyncio.TimeoutError:
+            pass
+    except Exception as exc:
+        logger.warning(
+            "Failed to dispatch %d TTS message(s) for steps %s: %s",
+            len(messages),
+            ", ".join(str(message["stepId"]) for message in messages),
+            exc,
+        )
+
+
+async def _tts_worker(queue: asyncio.Queue) -> None:
+    """Drain queued TTS messages, coalescing bursts into tts_batch frames."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + TTS_BATCH_WINDOW_SECONDS
+        while len(batch) < TTS_BATCH_MAX_MESSAGES:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        by_url: Dict[str, List[Dict[str, Any]]] = {}
+        for ws_url, message in batch:
+            by_url.setdefault(ws_url, []).append(message)
+        for ws_url, messages in by_url.items():
+            await _send_tts_batch(ws_url, messages)
+
+
+def get_tts_queue() -> asyncio.Queue:
+    """Get the TTS queue, starting its worker on the running event loop if needed."""
+    global _tts_queue, _tts_worker_task
+    loop = asyncio.get_running_loop()
+    if (
+        _tts_worker_task is None
+        or _tts_worker_task.done()
+        or _tts_worker_task.get_loop() is not loop
+    ):
+        _tts_queue = asyncio.Queue()
+        _tts_worker_task = loop.create_task(_tts_worker(_tts_queue))
+    return _tts_queue
+
 
 async def send_tts_message(
     text: str,
     session_id: str,
     step_id: str,
-    ws_url: str = DOM_SNAPSHOT_WS_URL_DEFAULT,
+    ws_url: Optional[str] = None,
     target_client_id: Optional[str] = None,
 ) -> None:
     """
-    Broadcast a TTS message to the frontend via the websocket bridge.
+    Queue a TTS message for broadcast to the frontend via the websocket bridge.
+    Returns without waiting for the bridge; delivery failures are logged.
     """
     if not text:
         return
@@ -584,39 +507,16 @@ async def send_tts_message(
         len(text),
     )
 
-    payload = {
-        "type": "tts_broadcast",
+    message = {
         "text": text,
         "sessionId": session_id,
         "stepId": step_id,
     }
     if target_client_id:
-        payload["targetClientId"] = target_client_id
-
-    try:
-        async with websockets.connect(ws_url, ping_interval=None) as websocket:
-            await websocket.send(json.dumps({"type": "register", "role": "backend"}))
+        message["targetClientId"] = target_client_id
 
-            # Best-effort read of register acknowledgement
-            try:
-                await asyncio.wait_for(websocket.recv(), timeout=1.0)
-            except asyncio.TimeoutError:
-                pass
-
-            await websocket.send(json.dumps(payload))
-
-            # Best-effort read of acknowledgement
-            try:
-                await asyncio.wait_for(websocket.recv(), timeout=1.0)
-            except asyncio.TimeoutError:
-                pass
-    except Exception as exc:
-        logger.warning(
-            "Failed to dispatch TTS message for session %s step %s: %s",
-            session_id,
-            step_id,
-            exc,
-        )
+    ws_url = ws_url or get_dom_snapshot_ws_settings().url
+    await get_tts_queue().put((ws_url, message))
 
 
 # ============================================================================
@@ -624,17 +524,39 @@ async def send_tts_message(
 # ============================================================================
 
 # LLM Agent API (port 8000)
-app = FastAPI(title="LLM Agent API", version="1.0.0")
+app = FastAPI(
+    title="LLM Agent API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 # Add CORS middleware for frontend integration
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ALLOW_ORIGINS,
+    allow_credentials=CORS_ALLOW_CREDENTIALS,
+    allow_methods=CORS_ALLOW_METHODS,
+    allow_headers=CORS_ALLOW_HEADERS,
 )
 
+# Server-Sent Event routes must reach the client unbuffered; older Starlette
+# GZip releases buffer text/event-stream bodies and stall the stream
+UNCOMPRESSED_PATHS = frozenset({"/decide/stream"})
+
+
+class StreamSafeGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that passes the streaming routes through untouched."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in UNCOMPRESSED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Plans and agent results can carry long generated code; compress larger bodies
+app.add_middleware(StreamSafeGZipMiddleware, minimum_size=1024)
+
 
 @app.post("/decide", response_model=List[DecideResponse])
 async def decide(request: DecideRequest) -> List[DecideResponse]:
@@ -662,6 +584,31 @@ async def decide(request: DecideRequest) -> List[DecideResponse]:
         )
 
 
+@app.post("/decide/stream")
+async def decide_stream(request: DecideRequest) -> StreamingResponse:
+    """
+    Streaming planner endpoint using Server-Sent Events.
+
+    Same input as /decide. Each DecideResponse is sent as a `data:` event as
+    soon as its task has been planned, so multi-task requests deliver the
+    first task before the LLM has finished the whole split. The stream ends
+    with an `event: done` message, or `event: error` if planning fails.
+    /decide remains the non-streaming endpoint used by the test harness.
+    """
+
+    async def event_stream():
+        try:
+            async for response in stream_user_request(request):
+                yield f"data: {response.model_dump_json()}\n\n"
+        except Exception as e:
+            error = json.dumps({"detail": f"Error processing request: {str(e)}"})
+            yield f"event: error\ndata: {error}\n\n"
+            return
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @app.post("/plan", response_model=PlanResponse)
 async def plan(request: PlanRequest) -> PlanResponse:
     """
@@ -689,17 +636,21 @@ async def plan(request: PlanRequest) -> PlanResponse:
       - agent_type: Type of agent that processed the task
     """
     try:
-        logger.info(f"Received /plan request for session: {request.sid}")
+        logger.info("Received /plan request for session: %s", request.sid)
         response = await execute_plan(request)
-        logger.info(f"Successfully completed /plan request for session: {request.sid}")
+        logger.info("Successfully completed /plan request for session: %s", request.sid)
         return response
     except Exception as e:
         logger.error(
-            f"Error processing /plan request for session {request.sid}: {str(e)}"
+            "Error processing /plan request for session %s: %s", request.sid, e
         )
         raise HTTPException(status_code=500, detail=f"Error executing plan: {str(e)}")
 
 
+# Shared with the planner; resolved once instead of on every /queue request
+_queue_manager = get_queue_manager()
+
+
 @app.get("/queue/{sid}", response_model=QueueStatus)
 async def get_queue_status(sid: str) -> QueueStatus:
     """
@@ -715,8 +666,7 @@ async def get_queue_status(sid: str) -> QueueStatus:
     - completed: List of completed tasks
     """
     try:
-        queue_manager = get_queue_manager()
-        status = await queue_manager.get_queue_status(sid)
+        status = await _queue_manager.get_queue_status(sid)
         return QueueStatus(sid=sid, **status)
     except Exception as e:
         raise HTTPException(
@@ -743,7 +693,7 @@ async def edit(request: EditRequest) -> EditResponse:
     - code: JSON Patch array as string
     """
     try:
-        response = process_edit_request(request)
+        response = await process_edit_request(request)
         return response
     except Exception as e:
         raise HTTPException(
@@ -824,24 +774,32 @@ async def action(request: ActionRequest) -> ActionResponse:
         )
 
 
+# Probes hit /health constantly; serve pre-encoded bytes instead of serializing
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "service": "llm-agent"})
+
+
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "llm-agent"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 # ============================================================================
 # Executor Bridge API (port 8100)
 # ============================================================================
 
-executor_app = FastAPI(title="Executor Bridge API", version="1.0.0")
+executor_app = FastAPI(
+    title="Executor Bridge API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 executor_app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ALLOW_ORIGINS,
+    allow_credentials=CORS_ALLOW_CREDENTIALS,
+    allow_methods=CORS_ALLOW_METHODS,
+    allow_headers=CORS_ALLOW_HEADERS,
 )
 
 
@@ -859,8 +817,9 @@ async def dom_snapshot(
     - ws_url: override websocket endpoint url.
     - timeout: override request timeout (seconds).
     """
-    resolved_ws_url = ws_url or DOM_SNAPSHOT_WS_URL_DEFAULT
-    resolved_timeout = timeout or DOM_SNAPSHOT_REQUEST_TIMEOUT_DEFAULT
+    settings = get_dom_snapshot_ws_settings()
+    resolved_ws_url = ws_url or settings.url
+    resolved_timeout = timeout or settings.timeout
 
     try:
         snapshot_response = await fetch_dom_snapshot(
@@ -869,64 +828,95 @@ async def dom_snapshot(
             target_client_id=target_client_id,
         )
 
-        snapshot = snapshot_response.get("snapshot", {})
-
-        system_prompt = get_system_prompt(snapshot)
-        return {
-            "snapshot": snapshot,
-            "systemPrompt": system_prompt,
-            "timestamp": snapshot_response.get("timestamp"),
-            "activeIframe": snapshot.get("activeIframe"),
-        }
     except RuntimeError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
+    snapshot = snapshot_response.get("snapshot", {})
+
+    # Build everything that can fail before the 200 status goes out, so a
+    # prompt error still surfaces as a proper 500 instead of truncated JSON.
+    # The serialized snapshot doubles as the prompt cache key.
+    snapshot_json = orjson.dumps(snapshot, option=orjson.OPT_SORT_KEYS)
+    system_prompt = get_cached_system_prompt(snapshot, snapshot_json)
+    tail = (
+        b',"systemPrompt":'
+        + orjson.dumps(system_prompt)
+        + b',"timestamp":'
+        + orjson.dumps(snapshot_response.get("timestamp"))
+        + b',"activeIframe":'
+        + orjson.dumps(snapshot.get("activeIframe"))
+        + b"}"
+    )
+
+    async def response_body():
+        # Stream the pieces instead of copying the snapshot into one body
+        yield b'{"snapshot":'
+        yield snapshot_json
+        yield tail
+
+    return StreamingResponse(response_body(), media_type="application/json")
+
+
+_EXECUTOR_HEALTH_BODY = orjson.dumps(
+    {"status": "healthy", "service": "executor-bridge"}
+)
+
 
 @executor_app.get("/health")
 async def executor_health():
     """Health check endpoint for executor service."""
-    return {"status": "healthy", "service": "executor-bridge"}
+    return Response(content=_EXECUTOR_HEALTH_BODY, media_type="application/json")
 
 
 # ============================================================================
 # Server Startup Functions (must be at module level for multiprocessing)
 # ============================================================================
 
-# Configure uvicorn logging
-log_config = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "default": {
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        },
-    },
-    "handlers": {
-        "default": {
-            "formatter": "default",
-            "class": "logging.StreamHandler",
-            "stream": "ext://sys.stdout",
-        },
-    },
-    "root": {
-        "level": "INFO",
-        "handlers": ["default"],
-    },
+# Logging is configured at import (see above); both servers share these options
+UVICORN_RUN_OPTIONS = {
+    "log_config": None,
+    "log_level": "info",
+    "access_log": False,
 }
 
 
+def resolve_uvicorn_loop() -> str:
+    """Prefer uvloop for the event loop; it is unavailable on Windows."""
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return "asyncio"
+    return "uvloop"
+
+
+def resolve_uvicorn_http() -> str:
+    """Prefer the httptools HTTP parser, falling back to h11."""
+    try:
+        import httptools  # noqa: F401
+    except ImportError:
+        return "h11"
+    return "httptools"
+
+
 def run_llm_server():
     """Run LLM Agent API using configured host/port."""
     import uvicorn
 
-    logger.info("Starting LLM Agent API on %s:%s", LLM_SERVER_HOST, LLM_SERVER_PORT)
+    logger.info(
+        "Starting LLM Agent API on %s:%s (workers=%s)",
+        LLM_SERVER_HOST,
+        LLM_SERVER_PORT,
+        LLM_SERVER_WORKERS,
+    )
     uvicorn.run(
         "llm.server:app",
         host=LLM_SERVER_HOST,
         port=LLM_SERVER_PORT,
-        log_config=log_config,
-        log_level="info",
+        loop=resolve_uvicorn_loop(),
+        http=resolve_uvicorn_http(),
+        workers=LLM_SERVER_WORKERS,
         reload=bool(os.getenv("LLM_SERVER_RELOAD", "")),
+        **UVICORN_RUN_OPTIONS,
     )
 
 
@@ -943,18 +933,28 @@ def run_executor_server():
         "llm.server:executor_app",
         host=EXECUTOR_SERVER_HOST,
         port=EXECUTOR_SERVER_PORT,
-        log_config=log_config,
-        log_level="info",
+        loop=resolve_uvicorn_loop(),
+        http=resolve_uvicorn_http(),
         reload=bool(os.getenv("EXECUTOR_SERVER_RELOAD", "")),
+        **UVICORN_RUN_OPTIONS,
     )
 
 
 if __name__ == "__main__":
     import multiprocessing
 
+    # forkserver children start from a clean template process instead of
+    # inheriting this process's threads and sockets; Windows only has spawn
+    start_method = (
+        "forkserver"
+        if "forkserver" in multiprocessing.get_all_start_methods()
+        else "spawn"
+    )
+    mp_context = multiprocessing.get_context(start_method)
+
     # Start both servers in separate processes
-    llm_process = multiprocessing.Process(target=run_llm_server, name="LLM-Server")
-    executor_process = multiprocessing.Process(
+    llm_process = mp_context.Process(target=run_llm_server, name="LLM-Server")
+    executor_process = mp_context.Process(
         target=run_executor_server, name="Executor-Server"
     )
 
@@ -4,7 +4,7 @@ Executes tests against /plan endpoint and generates comprehensive reports.
 """
 
 import asyncio
-import json
+import os
 import time
 from pathlib import Path
 import sys
@@ -20,6 +20,8 @@ except ImportError:
     print("  cd llm && source venv/bin/activate && pip install httpx")
     sys.exit(1)
 
+import orjson
+
 from llm.tests.test_definitions import get_all_tests
 from llm.tests.validator import run_all_validations, generate_test_summary, generate_overall_summary
 
@@ -27,7 +29,31 @@ from llm.tests.validator import run_all_validations, generate_test_summary, gene
 # Configuration
 API_BASE_URL = "http://localhost:8000"
 RESULTS_DIR = Path(__file__).resolve().parent / "results"
+RUN_COUNTER_FILE = RESULTS_DIR / ".next_run"
 TIMEOUT = 180  # seconds per request (longer for orchestration)
+# Max tests in flight; 1 runs them one at a time for per-test latency baselines
+MAX_CONCURRENT_TESTS = int(os.getenv("ORCHESTRATION_TEST_CONCURRENCY", "4"))
+TEST_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_TESTS)
+# uvicorn only speaks HTTP/1.1, so reuse keep-alive connections across tests
+CLIENT_LIMITS = httpx.Limits(
+    max_connections=MAX_CONCURRENT_TESTS + 1,
+    max_keepalive_connections=MAX_CONCURRENT_TESTS + 1,
+    keepalive_expiry=60.0,
+)
+
+
+def find_next_run_number():
+    """Scan existing run-N directories for the next free run number."""
+    # scandir reuses the dirent type, so non-run entries cost no stat call
+    with os.scandir(RESULTS_DIR) as entries:
+        numbers = [
+            int(entry.name[4:])
+            for entry in entries
+            if entry.name.startswith("run-")
+            and entry.name[4:].isdigit()
+            and entry.is_dir()
+        ]
+    return max(numbers) + 1 if numbers else 1
 
 
 def get_test_run_dir():
@@ -35,21 +61,22 @@ def get_test_run_dir():
     if not RESULTS_DIR.exists():
         RESULTS_DIR.mkdir(exist_ok=True)
     
-    existing_runs = [d for d in RESULTS_DIR.iterdir() if d.is_dir() and d.name.startswith("run-")]
-    if existing_runs:
-        numbers = []
-        for d in existing_runs:
-            try:
-                num = int(d.name.split("-")[1])
-                numbers.append(num)
-            except (IndexError, ValueError):
-                pass
-        next_num = max(numbers) + 1 if numbers else 1
-    else:
-        next_num = 1
+    # The counter file avoids listing every previous run; scan only to seed it
+    try:
+        next_num = int(RUN_COUNTER_FILE.read_text())
+    except (FileNotFoundError, ValueError):
+        next_num = find_next_run_number()
     
-    run_dir = RESULTS_DIR / f"run-{next_num}"
-    run_dir.mkdir(exist_ok=True)
+    # mkdir is the atomic claim: a stale counter or a concurrent run skips
+    # ahead instead of reusing (and overwriting) an existing run directory
+    while True:
+        run_dir = RESULTS_DIR / f"run-{next_num}"
+        try:
+            run_dir.mkdir(exist_ok=False)
+            break
+        except FileExistsError:
+            next_num += 1
+    RUN_COUNTER_FILE.write_text(str(next_num + 1))
     return run_dir
 
 
@@ -60,7 +87,6 @@ def ensure_results_dir():
 
 async def send_plan_request(client, sid, text, step_id):
     """Send request to /plan endpoint."""
-    url = f"{API_BASE_URL}/plan"
     payload = {
         "sid": sid,
         "text": text,
@@ -68,7 +94,7 @@ async def send_plan_request(client, sid, text, step_id):
     }
     
     try:
-        response = await client.post(url, json=payload, timeout=TIMEOUT)
+        response = await client.post("/plan", json=payload, timeout=TIMEOUT)
         response.raise_for_status()
         return response.json()
     except httpx.TimeoutException:
@@ -81,9 +107,12 @@ async def send_plan_request(client, sid, text, step_id):
 
 async def run_single_test(test, client):
     """Run a single test case."""
-    test_start = time.time()
+    test_start = time.perf_counter_ns()
     
     print(f"[{test['id']}] Running: {test['name']}")
+    if MAX_CONCURRENT_TESTS == 1:
+        # One test in flight: show what is running while it runs
+        sys.stdout.flush()
     
     # Send request to /plan endpoint
     request_step_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{test['sid']}-{test['id']}"))
@@ -95,14 +124,14 @@ async def run_single_test(test, client):
         request_step_id,
     )
     
-    test_duration = time.time() - test_start
+    test_duration = (time.perf_counter_ns() - test_start) / 1e9
     
     # Prepare input data for summary
     input_data = {
         "sid": test["sid"],
         "text": test["text"],
         "expected_tasks": test.get("expected_tasks", 1),
-        "expected_agents": test.get("expected_agents", []),
+        "expected_agents": test.get("expected_agents", ()),
         "step_id": request_step_id,
     }
     
@@ -141,31 +170,46 @@ async def run_single_test(test, client):
     status = "✓" if result["passed"] else "✗"
     tasks_info = f"({result.get('metrics', {}).get('actual_tasks', 0)} tasks)"
     print(f"[{test['id']}] {status} Completed in {test_duration:.2f}s {tasks_info}")
+    sys.stdout.flush()
     
     return result
 
 
-async def check_server_health():
+async def run_bounded_test(test, client):
+    """Run a single test once a concurrency slot is free."""
+    async with TEST_SEMAPHORE:
+        return await run_single_test(test, client)
+
+
+async def check_server_health(client):
     """Check if server is running."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{API_BASE_URL}/health", timeout=5)
-            if response.status_code == 200:
-                return True
+        response = await client.get("/health", timeout=5)
+        if response.status_code == 200:
+            return True
     except Exception:
         pass
     return False
 
 
 async def run_all_tests():
-    """Run all orchestration tests."""
+    """Run all orchestration tests over one shared keep-alive client."""
+    async with httpx.AsyncClient(
+        base_url=API_BASE_URL, timeout=TIMEOUT, limits=CLIENT_LIMITS
+    ) as client:
+        return await run_test_suite(client)
+
+
+async def run_test_suite(client):
+    """Run all orchestration tests using the given client."""
     print("=" * 70)
     print("ORCHESTRATION PIPELINE TEST SUITE")
     print("=" * 70)
     
     # Check server health
     print("\nChecking server health...")
-    if not await check_server_health():
+    sys.stdout.flush()
+    if not await check_server_health(client):
         print(f"❌ Error: Server not running at {API_BASE_URL}")
         print("\nStart the server with:")
         print("  cd llm && source venv/bin/activate")
@@ -181,29 +225,42 @@ async def run_all_tests():
     # Get all tests
     tests = get_all_tests()
     
-    print(f"\nRunning {len(tests)} tests sequentially...")
+    if MAX_CONCURRENT_TESTS > 1:
+        print(f"\nRunning {len(tests)} tests, {MAX_CONCURRENT_TESTS} at a time...")
+    else:
+        print(f"\nRunning {len(tests)} tests sequentially...")
     print(f"Results will be saved to: {run_dir.name}/")
     print()
+    sys.stdout.flush()
     
-    overall_start = time.time()
+    overall_start = time.perf_counter_ns()
     
-    # Run all tests sequentially to measure actual timing
     test_results = []
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+    if MAX_CONCURRENT_TESTS > 1:
+        test_results = await asyncio.gather(
+            *(run_bounded_test(test, client) for test in tests)
+        )
+    else:
+        # Run all tests sequentially to measure actual timing
         for i, test in enumerate(tests, 1):
             print(f"\n--- Test {i}/{len(tests)} ---")
             result = await run_single_test(test, client)
             test_results.append(result)
     
-    overall_duration = time.time() - overall_start
+    overall_duration = (time.perf_counter_ns() - overall_start) / 1e9
     
     # Generate overall summary
     overall_summary = generate_overall_summary(test_results, overall_duration)
     
     # Save overall summary
     summary_file = run_dir / "summary.json"
-    with open(summary_file, "w") as f:
-        json.dump(overall_summary, f, indent=2)
+    # Agent keys come from responses and may be null, hence OPT_NON_STR_KEYS
+    with open(summary_file, "wb") as f:
+        f.write(
+            orjson.dumps(
+                overall_summary, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        )
     
     # Print final results
     print("\n" + "=" * 70)
@@ -308,6 +365,10 @@ async def run_all_tests():
 
 def main():
     """Main entry point."""
+    # Piped output is flushed at explicit points (header, test start/finish)
+    # instead of per print; an interactive terminal keeps line buffering
+    if not sys.stdout.isatty():
+        sys.stdout.reconfigure(line_buffering=False)
     try:
         summary = asyncio.run(run_all_tests())
         
@@ -14,7 +14,7 @@ ORCHESTRATION_TESTS = [
         "text": "Create a blue button that says Submit",
         "description": "Simple single-task EDIT workflow",
         "expected_tasks": 1,
-        "expected_agents": ["edit"]
+        "expected_agents": ("edit",)
     },
     {
         "id": "orch-edit-02",
@@ -23,7 +23,7 @@ ORCHESTRATION_TESTS = [
         "text": "Make the heading larger and bold",
         "description": "Simple style modification EDIT",
         "expected_tasks": 1,
-        "expected_agents": ["edit"]
+        "expected_agents": ("edit",)
     },
     {
         "id": "orch-edit-03",
@@ -32,7 +32,7 @@ ORCHESTRATION_TESTS = [
         "text": "Add a navigation bar with logo on left and menu items on right",
         "description": "Complex single-task EDIT",
         "expected_tasks": 1,
-        "expected_agents": ["edit"]
+        "expected_agents": ("edit",)
     },
     
     # =================================================================
@@ -45,7 +45,7 @@ ORCHESTRATION_TESTS = [
         "text": "Click the submit button",
         "description": "Simple single-task ACT workflow",
         "expected_tasks": 1,
-        "expected_agents": ["act"]
+        "expected_agents": ("act",)
     },
     {
         "id": "orch-act-02",
@@ -54,7 +54,7 @@ ORCHESTRATION_TESTS = [
         "text": "Scroll down to the footer",
         "description": "Scroll action ACT workflow",
         "expected_tasks": 1,
-        "expected_agents": ["act"]
+        "expected_agents": ("act",)
     },
     {
         "id": "orch-act-03",
@@ -63,7 +63,7 @@ ORCHESTRATION_TESTS = [
         "text": "Navigate to the about page",
         "description": "Navigation ACT workflow",
         "expected_tasks": 1,
-        "expected_agents": ["act"]
+        "expected_agents": ("act",)
     },
     
     # =================================================================
@@ -76,7 +76,7 @@ ORCHESTRATION_TESTS = [
         "text": "Change the thing at the top",
         "description": "Ambiguous request requiring clarification",
         "expected_tasks": 1,
-        "expected_agents": ["clarify"]
+        "expected_agents": ("clarify",)
     },
     {
         "id": "orch-clarify-02",
@@ -85,7 +85,7 @@ ORCHESTRATION_TESTS = [
         "text": "Make it better",
         "description": "Vague request needing clarification",
         "expected_tasks": 1,
-        "expected_agents": ["clarify"]
+        "expected_agents": ("clarify",)
     },
     
     # =================================================================
@@ -98,7 +98,7 @@ ORCHESTRATION_TESTS = [
         "text": "Create a login form and make the submit button blue",
         "description": "Two EDIT tasks in sequence",
         "expected_tasks": 2,
-        "expected_agents": ["edit", "edit"]
+        "expected_agents": ("edit", "edit")
     },
     {
         "id": "orch-multi-edit-02",
@@ -107,7 +107,7 @@ ORCHESTRATION_TESTS = [
         "text": "Add a hero section with title, then add a subtitle below it, and make both centered",
         "description": "Three EDIT tasks in sequence",
         "expected_tasks": 3,
-        "expected_agents": ["edit", "edit", "edit"]
+        "expected_agents": ("edit", "edit", "edit")
     },
     {
         "id": "orch-multi-act-01",
@@ -116,7 +116,7 @@ ORCHESTRATION_TESTS = [
         "text": "Scroll down and then click the contact button",
         "description": "Two ACT tasks in sequence",
         "expected_tasks": 2,
-        "expected_agents": ["act", "act"]
+        "expected_agents": ("act", "act")
     },
     
     # =================================================================
@@ -129,7 +129,7 @@ ORCHESTRATION_TESTS = [
         "text": "Create a submit button and then click it",
         "description": "EDIT followed by ACT",
         "expected_tasks": 2,
-        "expected_agents": ["edit", "act"]
+        "expected_agents": ("edit", "act")
     },
     {
         "id": "orch-mixed-02",
@@ -138,7 +138,7 @@ ORCHESTRATION_TESTS = [
         "text": "Scroll to footer and change its background to dark gray",
         "description": "ACT followed by EDIT",
         "expected_tasks": 2,
-        "expected_agents": ["act", "edit"]
+        "expected_agents": ("act", "edit")
     },
     {
         "id": "orch-mixed-03",
@@ -147,7 +147,7 @@ ORCHESTRATION_TESTS = [
         "text": "Add a pricing table, scroll to it, and then update the prices",
         "description": "Complex mixed workflow",
         "expected_tasks": 3,
-        "expected_agents": ["edit", "act", "edit"]
+        "expected_agents": ("edit", "act", "edit")
     },
     {
         "id": "orch-mixed-04",
@@ -156,7 +156,7 @@ ORCHESTRATION_TESTS = [
         "text": "Create a form, click the first field, and adjust something about the layout",
         "description": "EDIT, ACT, and potentially CLARIFY",
         "expected_tasks": 3,
-        "expected_agents": ["edit", "act", "edit"]  # "adjust something" might be edit or clarify
+        "expected_agents": ("edit", "act", "edit")  # "adjust something" might be edit or clarify
     },
     
     # =================================================================
@@ -169,7 +169,7 @@ ORCHESTRATION_TESTS = [
         "text": "Blue button",
         "description": "Minimal request with limited context",
         "expected_tasks": 1,
-        "expected_agents": ["edit"]
+        "expected_agents": ("edit",)
     },
     {
         "id": "orch-edge-02",
@@ -178,7 +178,7 @@ ORCHESTRATION_TESTS = [
         "text": "Create a comprehensive dashboard with sidebar navigation containing links to dashboard, analytics, reports, and settings, then add a top header with search bar and notifications, and finally add metric cards showing user count, revenue, and conversion rates",
         "description": "Long complex multi-task request",
         "expected_tasks": 3,
-        "expected_agents": ["edit", "edit", "edit"]
+        "expected_agents": ("edit", "edit", "edit")
     },
     {
         "id": "orch-edge-03",
@@ -187,7 +187,7 @@ ORCHESTRATION_TESTS = [
         "text": "Add a button with text 'Sign Up -> Start Free!' and make it 100% width",
         "description": "Request with special characters",
         "expected_tasks": 2,
-        "expected_agents": ["edit", "edit"]
+        "expected_agents": ("edit", "edit")
     },
     {
         "id": "orch-edge-04",
@@ -196,7 +196,7 @@ ORCHESTRATION_TESTS = [
         "text": "Set container max-width to 1200px, padding to 20px, and margin to auto",
         "description": "Technical CSS specifications",
         "expected_tasks": 1,
-        "expected_agents": ["edit"]
+        "expected_agents": ("edit",)
     },
     {
         "id": "orch-edge-05",
@@ -205,7 +205,7 @@ ORCHESTRATION_TESTS = [
         "text": "Add a card with pricing info, make it have rounded corners, and add a shadow effect",
         "description": "Multiple related edits building on each other",
         "expected_tasks": 3,
-        "expected_agents": ["edit", "edit", "edit"]
+        "expected_agents": ("edit", "edit", "edit")
     }
 ]
 
@@ -215,22 +215,27 @@ def get_all_tests():
     return ORCHESTRATION_TESTS
 
 
+TEST_CATEGORIES = ("edit", "act", "clarify", "multi-edit", "multi-act", "mixed", "edge")
+
+# Lookup tables built once at import
+_TESTS_BY_ID = {test["id"]: test for test in ORCHESTRATION_TESTS}
+_TESTS_BY_CATEGORY = {
+    category: [test for test in ORCHESTRATION_TESTS if category in test["id"]]
+    for category in TEST_CATEGORIES
+}
+
+
 def get_tests_by_category(category):
     """
     Get tests by category.
     Categories: 'edit', 'act', 'clarify', 'multi-edit', 'multi-act', 'mixed', 'edge'
     """
-    filtered = []
-    for test in ORCHESTRATION_TESTS:
-        if category in test["id"]:
-            filtered.append(test)
-    return filtered
+    tests = _TESTS_BY_CATEGORY.get(category)
+    if tests is None:
+        tests = [test for test in ORCHESTRATION_TESTS if category in test["id"]]
+    return list(tests)
 
 
 def get_test_by_id(test_id):
     """Get a specific test by ID."""
-    for test in ORCHESTRATION_TESTS:
-        if test["id"] == test_id:
-            return test
-    return None
-
+    return _TESTS_BY_ID.get(test_id)
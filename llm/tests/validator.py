@@ -3,15 +3,30 @@ Validator for orchestration pipeline tests.
 Validates routing, response structure, and agent outputs.
 """
 
-import json
+from collections import Counter, defaultdict
+
+import orjson
+
+# Schemas used by the validators, built once at import
+PLAN_RESPONSE_FIELDS = ("sid", "results")
+AGENT_RESULT_FIELDS = ("session_id", "step_id", "intent", "context", "result", "agent_type")
+AGENT_TYPES = ["edit", "act", "clarify"]
+_AGENT_TYPE_SET = frozenset(AGENT_TYPES)
+EDIT_NODE_FIELDS = ("id", "type", "props")
+# Shared read-only default for missing metrics
+_EMPTY = {}
+
+
+def _first_missing(obj, fields):
+    """Return the first of fields missing from obj, or None."""
+    return next((field for field in fields if field not in obj), None)
 
 
 def validate_plan_response(response):
     """Validate basic PlanResponse structure."""
-    if "sid" not in response:
-        return False, "Missing 'sid' field in response"
-    if "results" not in response:
-        return False, "Missing 'results' field in response"
+    missing = _first_missing(response, PLAN_RESPONSE_FIELDS)
+    if missing is not None:
+        return False, f"Missing '{missing}' field in response"
     if not isinstance(response["results"], list):
         return False, "'results' must be a list"
     return True, None
@@ -19,16 +34,13 @@ def validate_plan_response(response):
 
 def validate_agent_result(result):
     """Validate AgentResult structure."""
-    required_fields = ["session_id", "step_id", "intent", "context", "result", "agent_type"]
-    
-    for field in required_fields:
-        if field not in result:
-            return False, f"Missing required field: {field}"
+    missing = _first_missing(result, AGENT_RESULT_FIELDS)
+    if missing is not None:
+        return False, f"Missing required field: {missing}"
     
     # Validate agent_type is one of the expected values
-    valid_agents = ["edit", "act", "clarify"]
-    if result["agent_type"] not in valid_agents:
-        return False, f"Invalid agent_type: {result['agent_type']} (must be one of {valid_agents})"
+    if result["agent_type"] not in _AGENT_TYPE_SET:
+        return False, f"Invalid agent_type: {result['agent_type']} (must be one of {AGENT_TYPES})"
     
     return True, None
 
@@ -36,7 +48,7 @@ def validate_agent_result(result):
 def validate_edit_output(result_string):
     """Validate EDIT agent output is valid JSON."""
     try:
-        component = json.loads(result_string)
+        component = orjson.loads(result_string)
         
         # Check for basic component structure (allowing the new AST-style envelope)
         top_level = component
@@ -50,15 +62,12 @@ def validate_edit_output(result_string):
         # Choose the node we will validate (prefer the tree/component payload when present)
         node = tree or top_level
 
-        if "id" not in node:
-            return False, "EDIT output missing 'id' field"
-        if "type" not in node:
-            return False, "EDIT output missing 'type' field"
-        if "props" not in node:
-            return False, "EDIT output missing 'props' field"
+        missing = _first_missing(node, EDIT_NODE_FIELDS)
+        if missing is not None:
+            return False, f"EDIT output missing '{missing}' field"
         
         return True, None
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         return False, f"EDIT output is not valid JSON: {e}"
 
 
@@ -80,6 +89,70 @@ def validate_clarify_output(result_string):
     return True, None
 
 
+# Agent-specific output validators and their labels in error messages
+OUTPUT_VALIDATORS = {
+    "edit": (validate_edit_output, "EDIT"),
+    "act": (validate_act_output, "ACT"),
+    "clarify": (validate_clarify_output, "CLARIFY"),
+}
+
+
+def validate_result(idx, result, expected_agent=None):
+    """
+    Validate a single AgentResult against the expected agent, if any.
+    
+    Returns:
+        checks: dict of valid / correct_agent / output_valid results
+        passed: bool indicating if this result passed
+        errors: list of error messages
+        task_detail: dict for reporting, or None if the result is malformed
+    """
+    checks = {}
+    passed = True
+    errors = []
+    
+    result_valid, result_error = validate_agent_result(result)
+    checks["valid"] = result_valid
+    
+    if not result_valid:
+        errors.append(f"Result {idx}: {result_error}")
+        return checks, False, errors, None
+    
+    # Extract task details
+    agent_type = result["agent_type"]
+    intent = result.get("intent", "")
+    
+    # Extract meaningful intent (first part before |)
+    intent_short = intent.split("|")[0].strip() if "|" in intent else intent[:80]
+    
+    task_detail = {
+        "task_number": idx + 1,
+        "agent_type": agent_type,
+        "intent": intent_short,
+        "step_id": result.get("step_id", ""),
+    }
+    
+    # 4. Validate agent routing
+    if expected_agent is not None:
+        checks["correct_agent"] = agent_type == expected_agent
+        
+        if agent_type != expected_agent:
+            # Allow some flexibility for clarify vs edit
+            if not (agent_type == "clarify" and expected_agent == "edit"):
+                errors.append(f"Result {idx}: expected agent '{expected_agent}', got '{agent_type}'")
+                passed = False
+    
+    # 5. Validate agent-specific output format
+    validator, label = OUTPUT_VALIDATORS[agent_type]
+    output_valid, output_error = validator(result["result"])
+    checks["output_valid"] = output_valid
+    if not output_valid:
+        errors.append(f"Result {idx} ({label}): {output_error}")
+        passed = False
+    
+    return checks, passed, errors, task_detail
+
+
 def run_all_validations(test, response, test_duration=0):
     """
     Run all validations for an orchestration test case.
@@ -116,78 +189,37 @@ def run_all_validations(test, response, test_duration=0):
         errors.append(f"Task count mismatch: expected {expected_tasks}, got {actual_tasks}")
         passed = False
     
-    # 3. Extract detailed task information
+    # 3. Validate each AgentResult and extract detailed task information
     task_details = []
-    
-    # 3. Validate each AgentResult
+    expected_agents = test.get("expected_agents", ())
+    expected_count = len(expected_agents)
     assertions["all_results_valid"] = True
+    per_result = []
     for idx, result in enumerate(results):
-        result_valid, result_error = validate_agent_result(result)
-        assertions[f"result_{idx}_valid"] = result_valid
-        
-        if not result_valid:
+        expected_agent = expected_agents[idx] if idx < expected_count else None
+        checks, result_passed, result_errors, task_detail = validate_result(
+            idx, result, expected_agent
+        )
+        per_result.append(checks)
+        errors.extend(result_errors)
+        if task_detail is None:
             assertions["all_results_valid"] = False
+        else:
+            task_details.append(task_detail)
+        if not result_passed:
             passed = False
-            errors.append(f"Result {idx}: {result_error}")
-            continue
-        
-        # Extract task details
-        agent_type = result["agent_type"]
-        intent = result.get("intent", "")
-        
-        # Extract meaningful intent (first part before |)
-        intent_short = intent.split("|")[0].strip() if "|" in intent else intent[:80]
-        
-        task_detail = {
-            "task_number": idx + 1,
-            "agent_type": agent_type,
-            "intent": intent_short,
-            "step_id": result.get("step_id", ""),
+    
+    # Flatten into the result_{idx}_* keys reported in summary.json
+    assertions.update(
+        {
+            f"result_{idx}_{name}": value
+            for idx, checks in enumerate(per_result)
+            for name, value in checks.items()
         }
-        task_details.append(task_detail)
-        
-        # 4. Validate agent routing
-        expected_agents = test.get("expected_agents", [])
-        
-        if idx < len(expected_agents):
-            expected_agent = expected_agents[idx]
-            assertions[f"result_{idx}_correct_agent"] = agent_type == expected_agent
-            
-            if agent_type != expected_agent:
-                # Allow some flexibility for clarify vs edit
-                if not (agent_type == "clarify" and expected_agent == "edit"):
-                    errors.append(f"Result {idx}: expected agent '{expected_agent}', got '{agent_type}'")
-                    passed = False
-        
-        # 5. Validate agent-specific output format
-        result_string = result["result"]
-        
-        if agent_type == "edit":
-            output_valid, output_error = validate_edit_output(result_string)
-            assertions[f"result_{idx}_output_valid"] = output_valid
-            if not output_valid:
-                errors.append(f"Result {idx} (EDIT): {output_error}")
-                passed = False
-        
-        elif agent_type == "act":
-            output_valid, output_error = validate_act_output(result_string)
-            assertions[f"result_{idx}_output_valid"] = output_valid
-            if not output_valid:
-                errors.append(f"Result {idx} (ACT): {output_error}")
-                passed = False
-        
-        elif agent_type == "clarify":
-            output_valid, output_error = validate_clarify_output(result_string)
-            assertions[f"result_{idx}_output_valid"] = output_valid
-            if not output_valid:
-                errors.append(f"Result {idx} (CLARIFY): {output_error}")
-                passed = False
+    )
     
     # 6. Routing correctness summary
-    correct_routing = all(
-        assertions.get(f"result_{i}_correct_agent", True)
-        for i in range(len(results))
-    )
+    correct_routing = all(checks.get("correct_agent", True) for checks in per_result)
     assertions["correct_routing"] = correct_routing
     metrics["correct_routing"] = correct_routing
     
@@ -197,11 +229,8 @@ def run_all_validations(test, response, test_duration=0):
     metrics["all_fields_present"] = all_fields_present
     
     # 8. Agent distribution
-    agent_distribution = {}
-    for result in results:
-        agent_type = result.get("agent_type", "unknown")
-        agent_distribution[agent_type] = agent_distribution.get(agent_type, 0) + 1
-    metrics["agent_distribution"] = agent_distribution
+    agent_distribution = Counter(result.get("agent_type", "unknown") for result in results)
+    metrics["agent_distribution"] = dict(agent_distribution)
     
     # 9. Task details for reporting
     metrics["task_details"] = task_details
@@ -223,6 +252,11 @@ def run_all_validations(test, response, test_duration=0):
         for task_timing in timing_data.get("task_timings", []):
             task_timings_map[task_timing["step_id"]] = task_timing["duration_seconds"]
         
+        # First result per step_id, for tasks missing from task_timings
+        step_to_result = {}
+        for result in results:
+            step_to_result.setdefault(result.get("step_id"), result)
+        
         # Add real timing to task details
         for task in task_details:
             step_id = task.get("step_id")
@@ -230,10 +264,9 @@ def run_all_validations(test, response, test_duration=0):
                 task["actual_duration_seconds"] = task_timings_map[step_id]
             else:
                 # Fallback: check if result has execution_time
-                for result in results:
-                    if result.get("step_id") == step_id:
-                        task["actual_duration_seconds"] = result.get("execution_time_seconds", 0)
-                        break
+                result = step_to_result.get(step_id)
+                if result is not None:
+                    task["actual_duration_seconds"] = result.get("execution_time_seconds", 0)
     else:
         # Fallback to estimates if no timing data available
         if actual_tasks > 0 and test_duration > 0:
@@ -266,79 +299,88 @@ def generate_test_summary(test_id, name, description, input_data, response,
     }
 
 
+def _duration_of(task):
+    """Task duration, preferring actual timing over estimates."""
+    if "actual_duration_seconds" in task:
+        return task["actual_duration_seconds"]
+    return task.get("estimated_duration_seconds", 0)
+
+
 def generate_overall_summary(test_results, total_duration):
     """Generate overall test run summary."""
     total_tests = len(test_results)
-    passed = sum(1 for t in test_results if t.get("passed", False))
-    failed = total_tests - passed
-    success_rate = f"{(passed / total_tests * 100):.1f}%" if total_tests > 0 else "0%"
-    
-    # Aggregate metrics
-    total_tasks = sum(t.get("metrics", {}).get("actual_tasks", 0) for t in test_results)
-    routing_successes = sum(1 for t in test_results if t.get("metrics", {}).get("correct_routing", False))
     
-    # Agent distribution across all tests
-    all_agents = {}
-    for test in test_results:
-        dist = test.get("metrics", {}).get("agent_distribution", {})
-        for agent, count in dist.items():
-            all_agents[agent] = all_agents.get(agent, 0) + count
-    
-    # Calculate average time per task
-    total_task_time = sum(t["duration_seconds"] for t in test_results)
-    average_per_task = round(total_task_time / total_tasks, 3) if total_tasks > 0 else 0
-    
-    # Calculate average per agent type using actual timing data
-    agent_times = {}
-    agent_counts = {}
-    for test in test_results:
-        task_details = test.get("metrics", {}).get("task_details", [])
+    # Aggregate counts, metrics, agent timings and the per-test breakdown in one pass
+    passed = 0
+    routing_successes = 0
+    tests_with_timing = 0
+    total_tasks = 0
+    total_task_time = 0
+    total_planner_time = 0
+    all_agents = Counter()
+    agent_times = defaultdict(float)
+    agent_counts = defaultdict(int)
+    timing_by_test = []
+    for t in test_results:
+        metrics = t.get("metrics") or _EMPTY
+        task_details = metrics.get("task_details", ())
+        duration_seconds = t["duration_seconds"]
+        actual_tasks = metrics.get("actual_tasks", 0)
+        planner_time = metrics.get("planner_time_seconds", 0)
+        
+        if t.get("passed", False):
+            passed += 1
+        if metrics.get("correct_routing", False):
+            routing_successes += 1
+        if planner_time > 0:
+            tests_with_timing += 1
+        total_tasks += actual_tasks
+        total_task_time += duration_seconds
+        total_planner_time += planner_time
+        all_agents.update(metrics.get("agent_distribution", _EMPTY))
+        
+        # Average per agent type using actual timing data
+        tasks = []
         for task in task_details:
             agent = task["agent_type"]
-            # Prefer actual timing over estimates
-            duration = task.get("actual_duration_seconds", task.get("estimated_duration_seconds", 0))
+            duration = _duration_of(task)
             if duration > 0:
-                agent_times[agent] = agent_times.get(agent, 0) + duration
-                agent_counts[agent] = agent_counts.get(agent, 0) + 1
-    
-    average_per_agent = {
-        agent: round(agent_times[agent] / agent_counts[agent], 3)
-        for agent in agent_times if agent_counts.get(agent, 0) > 0
-    }
-    
-    # Calculate planner timing statistics
-    total_planner_time = sum(t.get("metrics", {}).get("planner_time_seconds", 0) for t in test_results)
-    tests_with_timing = sum(1 for t in test_results if t.get("metrics", {}).get("planner_time_seconds", 0) > 0)
-    average_planner_time = round(total_planner_time / tests_with_timing, 3) if tests_with_timing > 0 else 0
-    
-    # Enhanced timing breakdown with task details
-    timing_by_test = []
-    for t in test_results:
-        task_details = t.get("metrics", {}).get("task_details", [])
-        metrics = t.get("metrics", {})
+                agent_times[agent] += duration
+                agent_counts[agent] += 1
+            tasks.append(
+                {
+                    "task_number": task["task_number"],
+                    "agent_type": agent,
+                    "intent": task["intent"],
+                    "duration_seconds": duration,
+                }
+            )
         
+        # Enhanced timing breakdown with task details
         test_timing = {
             "test_id": t["test_id"],
             "name": t["name"],
             "description": t.get("description", ""),
-            "duration_seconds": t["duration_seconds"],
-            "task_count": metrics.get("actual_tasks", 0),
-            "average_per_task": round(t["duration_seconds"] / max(1, metrics.get("actual_tasks", 1)), 3),
-            "planner_time_seconds": metrics.get("planner_time_seconds", 0),
+            "duration_seconds": duration_seconds,
+            "task_count": actual_tasks,
+            "average_per_task": round(duration_seconds / max(1, actual_tasks), 3),
+            "planner_time_seconds": planner_time,
             "total_agent_time_seconds": metrics.get("total_agent_time_seconds", 0),
             "orchestrator_overhead_seconds": metrics.get("orchestrator_overhead_seconds", 0),
-            "tasks": [
-                {
-                    "task_number": task["task_number"],
-                    "agent_type": task["agent_type"],
-                    "intent": task["intent"],
-                    "duration_seconds": task.get("actual_duration_seconds", task.get("estimated_duration_seconds", 0))
-                }
-                for task in task_details
-            ]
+            "tasks": tasks,
         }
         timing_by_test.append(test_timing)
     
+    failed = total_tests - passed
+    success_rate = f"{(passed / total_tests * 100):.1f}%" if total_tests > 0 else "0%"
+    average_per_task = round(total_task_time / total_tasks, 3) if total_tasks > 0 else 0
+    # Every agent in agent_times has a positive count
+    average_per_agent = {
+        agent: round(total / agent_counts[agent], 3)
+        for agent, total in agent_times.items()
+    }
+    average_planner_time = round(total_planner_time / tests_with_timing, 3) if tests_with_timing > 0 else 0
+    
     return {
         "total_tests": total_tests,
         "passed": passed,
@@ -352,7 +394,7 @@ def generate_overall_summary(test_results, total_duration):
         "total_planner_time": round(total_planner_time, 3),
         "total_tasks_executed": total_tasks,
         "routing_accuracy": f"{(routing_successes / total_tests * 100):.1f}%" if total_tests > 0 else "0%",
-        "agent_distribution": all_agents,
+        "agent_distribution": dict(all_agents),
         "timing_breakdown": timing_by_test,
         "tests": test_results
     }
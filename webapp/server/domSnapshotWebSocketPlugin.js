@@ -1,4 +1,5 @@
 import { createHash, randomBytes, randomUUID as cryptoRandomUUID } from 'node:crypto'
+import { rmSync } from 'node:fs'
 import { createServer } from 'node:http'
 
 const HANDSHAKE_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
@@ -202,10 +203,40 @@ const attachDomSnapshotBridge = (httpServer, options) => {
   }
 
   httpServer.__domSnapshotBridgeAttached = true
-  setupDomSnapshotBridge(httpServer, options)
+  const handleUpgrade = setupDomSnapshotBridge(options)
+  httpServer.on('upgrade', handleUpgrade)
+  httpServer.__domSnapshotUpgradeHandler = handleUpgrade
   return httpServer
 }
 
+// Extra listener on a UNIX domain socket for collocated backends. It shares
+// the bridge state (connected frontends, pending requests) of httpServer.
+const listenOnSocketPath = (httpServer, socketPath) => {
+  const handleUpgrade = httpServer?.__domSnapshotUpgradeHandler
+  if (!handleUpgrade) {
+    return null
+  }
+
+  const socketServer = createServer((req, res) => {
+    res.statusCode = 404
+    res.end('Not Found')
+  })
+  socketServer.on('upgrade', handleUpgrade)
+  socketServer.on('error', (error) => {
+    console.error('[DomSnapshotServer] UNIX socket server error:', error)
+  })
+
+  // A socket file left behind by a previous run would make listen() fail
+  rmSync(socketPath, { force: true })
+  socketServer.listen(socketPath, () => {
+    console.log(`[DomSnapshotServer] Listening on unix:${socketPath}`)
+  })
+
+  return () => {
+    socketServer.close()
+  }
+}
+
 export const domSnapshotWebSocketPlugin = (options = {}) => {
   const mergedOptions = {
     path: options.path || DEFAULT_PATH,
@@ -220,6 +251,7 @@ export const domSnapshotWebSocketPlugin = (options = {}) => {
 
   let standaloneServer = null
   let closeStandalone = null
+  let closeSocketServer = null
 
   return {
     name: 'dom-snapshot-websocket-plugin',
@@ -261,18 +293,30 @@ export const domSnapshotWebSocketPlugin = (options = {}) => {
             })
           }
         }
-        return
+      } else {
+        attachDomSnapshotBridge(viteHttpServer, mergedOptions)
       }
 
-      attachDomSnapshotBridge(viteHttpServer, mergedOptions)
+      if (options.socketPath && !closeSocketServer) {
+        closeSocketServer = listenOnSocketPath(
+          standaloneServer || viteHttpServer,
+          options.socketPath
+        )
+        viteHttpServer?.once('close', () => {
+          closeSocketServer?.()
+          closeSocketServer = null
+        })
+      }
     },
     async closeBundle() {
       closeStandalone?.()
+      closeSocketServer?.()
+      closeSocketServer = null
     }
   }
 }
 
-const setupDomSnapshotBridge = (httpServer, options) => {
+const setupDomSnapshotBridge = (options) => {
   const path = options.path || DEFAULT_PATH
   const requestTimeout = options.requestTimeout ?? DEFAULT_TIMEOUT_MS
 
@@ -394,6 +438,18 @@ const setupDomSnapshotBridge = (httpServer, options) => {
     }
   }
 
+  const speak = (target, requestId, message) => {
+    target.sendJson({
+      type: 'tts_speak',
+      requestId,
+      text: message.text || '',
+      sessionId: message.sessionId || null,
+      stepId: message.stepId || null,
+      metadata: message.metadata || null,
+      timestamp: Date.now()
+    })
+  }
+
   const handleTtsBroadcast = (backend, message) => {
     const target = resolveFrontendTarget(message.targetClientId)
     const requestId = message.requestId || createRequestId()
@@ -408,15 +464,7 @@ const setupDomSnapshotBridge = (httpServer, options) => {
       return
     }
 
-    target.sendJson({
-      type: 'tts_speak',
-      requestId,
-      text: message.text || '',
-      sessionId: message.sessionId || null,
-      stepId: message.stepId || null,
-      metadata: message.metadata || null,
-      timestamp: Date.now()
-    })
+    speak(target, requestId, message)
 
     backend.sendJson({
       type: 'tts_ack',
@@ -426,6 +474,28 @@ const setupDomSnapshotBridge = (httpServer, options) => {
     })
   }
 
+  // Several TTS messages coalesced by the backend; acknowledged once
+  const handleTtsBatch = (backend, message) => {
+    const requestId = message.requestId || createRequestId()
+    const messages = Array.isArray(message.messages) ? message.messages : []
+    let delivered = 0
+
+    for (const entry of messages) {
+      const target = resolveFrontendTarget(entry.targetClientId)
+      if (!target) continue
+      speak(target, createRequestId(), entry)
+      delivered += 1
+    }
+
+    backend.sendJson({
+      type: 'tts_ack',
+      requestId,
+      delivered: delivered === messages.length,
+      deliveredCount: delivered,
+      ...(delivered < messages.length ? { error: 'no_frontend_connected' } : {})
+    })
+  }
+
   const handleRegister = (connection, message) => {
     if (message.role !== 'frontend' && message.role !== 'backend') {
       connection.sendJson({ type: 'error', error: 'invalid_role' })
@@ -484,6 +554,13 @@ const setupDomSnapshotBridge = (httpServer, options) => {
         }
         handleTtsBroadcast(connection, message)
         break
+      case 'tts_batch':
+        if (connection.role !== 'backend') {
+          connection.sendJson({ type: 'error', error: 'unauthorized' })
+          break
+        }
+        handleTtsBatch(connection, message)
+        break
       case 'pong':
         connection.isAlive = true
         break
@@ -493,7 +570,7 @@ const setupDomSnapshotBridge = (httpServer, options) => {
     }
   }
 
-  httpServer.on('upgrade', (request, socket, head) => {
+  return (request, socket, head) => {
     const requestPath = (request.url || '').split('?')[0]
     if (requestPath !== path) {
       return
@@ -553,7 +630,5 @@ const setupDomSnapshotBridge = (httpServer, options) => {
     }
 
     broadcastStatus()
-  })
+  }
 }
-
-
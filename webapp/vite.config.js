@@ -24,6 +24,7 @@ const resolveDomSnapshotOptions = (env) => {
   const DOM_SNAPSHOT_WS_PORT = env.DOM_SNAPSHOT_WS_PORT
   const DOM_SNAPSHOT_WS_HOST = env.DOM_SNAPSHOT_WS_HOST
   const DOM_SNAPSHOT_WS_TIMEOUT_MS = env.DOM_SNAPSHOT_WS_TIMEOUT_MS
+  const DOM_SNAPSHOT_IPC = env.DOM_SNAPSHOT_IPC
 
   if (DOM_SNAPSHOT_WS_PATH) {
     options.path = DOM_SNAPSHOT_WS_PATH
@@ -44,6 +45,10 @@ const resolveDomSnapshotOptions = (env) => {
     )
   }
 
+  if (DOM_SNAPSHOT_IPC && DOM_SNAPSHOT_IPC.startsWith('unix:')) {
+    options.socketPath = DOM_SNAPSHOT_IPC.slice('unix:'.length)
+  }
+
   return options
 }
 